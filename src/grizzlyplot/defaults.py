@@ -18,5 +18,12 @@ plot_defaults = dict(
     xaxis_label_y=None,  # figure.supxlabel
     yaxis_label_x=None,  # get defaults from
     yaxis_label_y=None,  # figure.supylabel
-    legend=False
+    legend=False,
+
+    group_workers=None,  # threads for preparing geom
+                         # groups; None renders serially
+
+    large_data_threshold=None  # draw point groups larger than
+                               # this as a density raster;
+                               # None always draws markers
 )
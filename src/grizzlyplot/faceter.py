@@ -1,14 +1,18 @@
-import matplotlib.pyplot as plt
 import numpy as np
+import polars as pl
 from grizzlyplot.defaults import plot_defaults
 import math
+from functools import lru_cache
 
 
-def label_where(loc, default=None):
-    facet_label_pad_x = plot_defaults["facet_label_pad_x"]
-    facet_label_pad_y = plot_defaults["facet_label_pad_y"]
-
-    loc_dict = {
+@lru_cache(maxsize=None)
+def _label_locations(facet_label_pad_x, facet_label_pad_y):
+    """
+    Facet label locations for a given
+    set of label pads. Cached, so this
+    must not be handed out uncopied.
+    """
+    return {
         "bottom": {
             "y": -facet_label_pad_y,
             "x": 0.5},
@@ -28,11 +32,30 @@ def label_where(loc, default=None):
             "rotation": 270},
     }
 
-    return loc_dict.get(loc, default)
+
+def label_where(loc, default=None):
+    """
+    Label style dict for a facet label
+    location, or default if loc is unknown
+    """
+    loc_dict = _label_locations(
+        plot_defaults["facet_label_pad_x"],
+        plot_defaults["facet_label_pad_y"])
+    if loc not in loc_dict:
+        return default
+    return dict(loc_dict[loc])
+
+
+def _always(i_facet):
+    return True
+
+
+def _never(i_facet):
+    return False
 
 
 class AbstractFaceter:
-    facet_dimensions = set({})
+    facet_dimensions = frozenset()
     wrap_by_to_flatten_order = {
         "row": "C",
         "col": "F"
@@ -47,13 +70,32 @@ class AbstractFaceter:
         if facet_mapping is None:
             facet_mapping = dict()
         self.facet_mapping = facet_mapping
+        if wrap_by not in self.wrap_by_to_flatten_order.keys():
+            raise ValueError("Unknown faceter.wrap_by "
+                             "value {} for faceter {}. "
+                             "Expected one of the following: "
+                             "{}".format(
+                                 wrap_by,
+                                 self,
+                                 self.wrap_by_to_flatten_order.keys()))
         self.wrap_by = wrap_by
+        self._flatten_order = self.wrap_by_to_flatten_order[wrap_by]
         self.levels = dict()
+        self.level_labels = dict()
+        self._unfinalized_levels = set()
         self.sharex = sharex
         self.sharey = sharey
         self.label = label
+        self.reset_shape_cache()
         self.validate_facet_mapping()
 
+    def reset_shape_cache(self):
+        """
+        Forget cached facet counts. Called
+        whenever the facet levels change.
+        """
+        self._n_facets = None
+
     def validate_facet_mapping(self):
         for dim in self.facet_mapping.keys():
             if dim not in self.facet_dimensions:
@@ -70,19 +112,42 @@ class AbstractFaceter:
             dimension, None) is not None
 
     def n_facets(self):
-        return np.prod(
-            [self.n_levels(dim) if self.is_dimension_mapped(dim)
-             else 1
-             for dim in self.facet_dimensions],
-            dtype=np.int_)
+        if self._n_facets is None:
+            n_facets = 1
+            for dim in self.facet_dimensions:
+                if self.is_dimension_mapped(dim):
+                    n_facets *= self.n_levels(dim)
+            self._n_facets = n_facets
+        return self._n_facets
 
     def get_dimension_levels(self, dimension):
         if dimension not in self.facet_dimensions:
             raise ValueError("Faceter {} attempted to get levels "
                              "for unknown facet dimension "
                              "{}".format(self, dimension))
+        if dimension in self._unfinalized_levels:
+            self.finalize_levels(dimension)
         return self.levels.get(dimension, None)
 
+    def finalize_levels(self, dimension):
+        """
+        Deduplicate levels accumulated by
+        :meth:`add_levels_from_data` and
+        build their label strings. Deferred
+        until the levels are first needed.
+        """
+        levs = self.levels[dimension].unique(
+            maintain_order=True)
+        self.levels[dimension] = levs
+        self.level_labels[dimension] = [
+            "\n".join([str(x) for x in level])
+            for level in levs.rows()]
+        self._unfinalized_levels.discard(dimension)
+
+    def get_level_labels(self, dimension):
+        self.get_dimension_levels(dimension)
+        return self.level_labels.get(dimension, None)
+
     def n_levels(self, dimension):
         if not self.is_dimension_mapped(dimension):
             result = 0
@@ -92,7 +157,8 @@ class AbstractFaceter:
         return result
 
     def validate_facet_id(self, i_facet):
-        if i_facet not in range(self.n_facets()):
+        n_facets = self.n_facets()
+        if not 0 <= i_facet < n_facets:
             raise ValueError("Attempt to subset "
                              "data for a facet that "
                              "does not exist. Asked "
@@ -101,8 +167,8 @@ class AbstractFaceter:
                              "0 through {}, "
                              "are defined.".format(
                                  i_facet,
-                                 self.n_facets(),
-                                 self.n_facets() - 1))
+                                 n_facets,
+                                 n_facets - 1))
 
     def subset(self, data, i_facet):
         self.validate_facet_id(i_facet)
@@ -110,7 +176,10 @@ class AbstractFaceter:
         if data is None:
             subset = None
         else:
-            subset = data.clone()
+            # one fused query for the
+            # column mapping and filter
+            subset = data.lazy()
+            conditions = []
             for dimension in self.facet_dimensions:
                 if self.is_dimension_mapped(dimension):
                     dim_map = self.facet_mapping.get(
@@ -120,17 +189,73 @@ class AbstractFaceter:
                     i_dim = self.dimension_id_from_facet_id(
                         dimension,
                         i_facet)
-                    subset = subset.with_columns(
-                        dim_map
-                    ).join(
-                        dim_levels.slice(i_dim, 1),
-                        on=dim_map,
-                        how="inner")
+                    subset = subset.with_columns(dim_map)
+                    level = dim_levels.row(i_dim, named=True)
+                    conditions += [
+                        pl.col(name) == pl.lit(value)
+                        for name, value in level.items()]
                     pass  # end if dimension mapped
                 pass  # end loop over dimensions
+            if len(conditions) > 0:
+                subset = subset.filter(
+                    pl.all_horizontal(conditions))
+            subset = subset.collect()
             pass  # end else
         return subset
 
+    def partition(self, data):
+        """
+        Subset data for every facet at once,
+        with a single :meth:`polars.DataFrame.partition_by`
+        rather than one filter per facet. Returns
+        a list of subsets indexed by facet id,
+        equal to those from :meth:`subset`.
+        """
+        n_facets = self.n_facets()
+        if data is None:
+            return [None] * n_facets
+
+        keyed = data
+        key_names = []
+        for dimension in self.facet_dimensions:
+            if self.is_dimension_mapped(dimension):
+                keyed = keyed.with_columns(
+                    self.facet_mapping[dimension])
+                key_names += self.get_dimension_levels(
+                    dimension).columns
+        if len(key_names) < 1:
+            return [keyed] * n_facets
+        if len(set(key_names)) < len(key_names):
+            return [self.subset(data, i_facet)
+                    for i_facet in range(n_facets)]
+
+        # polars < 1.0 keys single-column
+        # partitions by scalar, not tuple
+        parts = {
+            key if isinstance(key, tuple) else (key,): part
+            for key, part in keyed.partition_by(
+                key_names,
+                maintain_order=True,
+                as_dict=True).items()}
+        empty = keyed.clear()
+        result = []
+        for i_facet in range(n_facets):
+            key = []
+            for dimension in self.facet_dimensions:
+                if self.is_dimension_mapped(dimension):
+                    key += self.get_dimension_levels(
+                        dimension).row(
+                            self.dimension_id_from_facet_id(
+                                dimension, i_facet))
+            if any(value is None or value != value
+                   for value in key):
+                # null and NaN levels compare
+                # differently in a filter
+                result.append(self.subset(data, i_facet))
+            else:
+                result.append(parts.get(tuple(key), empty))
+        return result
+
     def dimension_id_from_facet_id(self, dimension, i_facet):
         """
         Individual facet classes
@@ -184,17 +309,8 @@ class AbstractFaceter:
         and thus flattened row-major
         (order='C').
         """
-        if self.wrap_by not in self.wrap_by_to_flatten_order.keys():
-            ValueError("Unknown faceter.wrap_by "
-                       "value {} for faceter {}. "
-                       "Expected one of the following: "
-                       "{}".format(
-                           self.wrap_by,
-                           self,
-                           self.wrap_by_to_flatten_order.keys()))
-
-        return np.array(axis).flatten(
-            order=self.wrap_by_to_flatten_order[self.wrap_by])
+        return np.asarray(axis).ravel(
+            order=self._flatten_order)
 
     def subplots(self,
                  fig=None,
@@ -204,6 +320,9 @@ class AbstractFaceter:
         for plotting facets
         """
         if fig is None:
+            # deferred so that importing the
+            # faceters does not pull in pyplot
+            import matplotlib.pyplot as plt
             fig = plt.figure(**kwargs)
         nrows, ncols = self.get_subplots_shape(fig=fig)
         axis = fig.subplots(
@@ -256,19 +375,22 @@ class AbstractFaceter:
             i_facet,
             **kwargs)
 
+        # labels are figure text
+        # to avoid issues with
+        # artists outside
+        # axis bounds for tight/constrained
+        # layout
+        fig_text = ax.figure.text
+        default_transform = ax.transAxes
+
         for lbl in facet_labels:
             sty = lbl["style"]
-            # labels are figure text
-            # to avoid issues with
-            # artists outside
-            # axis bounds for tight/constrained
-            # layout
-            ax.figure.text(
+            fig_text(
                 x=sty.get("x", None),
                 y=sty.get("y", None),
                 s=lbl["text"],
                 transform=sty.get("transform",
-                                  ax.transAxes),
+                                  default_transform),
                 rotation=sty.get("rotation", 0),
                 horizontalalignment=sty.get(
                     "ha", "center"),
@@ -284,13 +406,16 @@ class AbstractFaceter:
                 mapped_expr = self.facet_mapping[dim]
                 new_levels = data.select(
                     mapped_expr
-                ).unique(
-                ).sort(
-                    mapped_expr
-                )
+                ).unique()
+                # sort on the selected columns rather than
+                # re-evaluating mapped_expr on its own output
+                new_levels = new_levels.sort(
+                    new_levels.columns)
                 self.levels[dim] = self.concat_levels(
-                    self.get_dimension_levels(dim),
+                    self.levels.get(dim, None),
                     new_levels)
+                self._unfinalized_levels.add(dim)
+        self.reset_shape_cache()
 
     def concat_levels(self,
                       old_levels,
@@ -300,17 +425,15 @@ class AbstractFaceter:
         elif old_levels is None:
             levs = new_levels
         else:
-            levs = old_levels.vstack(
-                new_levels)
-        if levs is not None:
-            levs = levs.unique(
-                maintain_order=True
-            ).clone()
+            levs = pl.concat(
+                [old_levels, new_levels],
+                how="vertical",
+                rechunk=False)
         return levs
 
 
 class NullFaceter(AbstractFaceter):
-    facet_dimensions = set({})
+    facet_dimensions = frozenset()
 
     def facet_id_mapper(self,
                         dimension,
@@ -323,7 +446,7 @@ class NullFaceter(AbstractFaceter):
 
 
 class GridFaceter(AbstractFaceter):
-    facet_dimensions = set({"row", "col"})
+    facet_dimensions = frozenset({"row", "col"})
 
     def __init__(self,
                  label_rows: bool | str = "right",
@@ -343,12 +466,25 @@ class GridFaceter(AbstractFaceter):
         self.label_cols = label_cols
         self.row_label_loc = row_label_loc
         self.col_label_loc = col_label_loc
+        self._row_label_predicate = self.make_row_label_predicate()
+        self._col_label_predicate = self.make_col_label_predicate()
+        self._row_label_style, self._col_label_style = (
+            self.resolve_label_styles())
+
+    def reset_shape_cache(self):
+        super().reset_shape_cache()
+        self._n_rows = None
+        self._n_cols = None
 
     def n_rows(self):
-        return max(1, self.n_levels("row"))
+        if self._n_rows is None:
+            self._n_rows = max(1, self.n_levels("row"))
+        return self._n_rows
 
     def n_cols(self):
-        return max(1, self.n_levels("col"))
+        if self._n_cols is None:
+            self._n_cols = max(1, self.n_levels("col"))
+        return self._n_cols
 
     def rows_faceted(self):
         return self.n_levels("row") > 0
@@ -368,13 +504,14 @@ class GridFaceter(AbstractFaceter):
         """
         return self.n_rows(), self.n_cols()
 
+    def row_col_id(self, i_facet):
+        return divmod(int(i_facet), self.n_cols())
+
     def row_id(self, i_facet):
-        return int(i_facet / self.n_cols())
+        return self.row_col_id(i_facet)[0]
 
     def col_id(self, i_facet):
-        return int(i_facet -
-                   self.n_cols() *
-                   self.row_id(i_facet))
+        return self.row_col_id(i_facet)[1]
 
     def facet_id_mapper(
             self,
@@ -396,9 +533,11 @@ class GridFaceter(AbstractFaceter):
                                        self))
         return result
 
-    def labeling_method(self,
-                        i_facet,
-                        **kwargs):
+    def resolve_label_styles(self):
+        """
+        Resolve row_label_loc and col_label_loc
+        to label style dicts
+        """
         # default locs
         r_lbl = label_where("right")
         c_lbl = label_where("top")
@@ -406,7 +545,7 @@ class GridFaceter(AbstractFaceter):
         if isinstance(
                 self.row_label_loc,
                 dict):
-            r_lbl.update(self.row_label_loc)
+            r_lbl = dict(r_lbl, **self.row_label_loc)
         elif isinstance(
                 self.row_label_loc,
                 str):
@@ -417,15 +556,21 @@ class GridFaceter(AbstractFaceter):
         if isinstance(
                 self.col_label_loc,
                 dict):
-            c_lbl.update(self.col_label_loc)
+            c_lbl = dict(c_lbl, **self.col_label_loc)
         elif isinstance(
                 self.col_label_loc,
                 str):
             c_lbl = label_where(
                 self.col_label_loc,
                 c_lbl)
-        i_row = self.row_id(i_facet)
-        i_col = self.col_id(i_facet)
+        return r_lbl, c_lbl
+
+    def labeling_method(self,
+                        i_facet,
+                        **kwargs):
+        r_lbl = self._row_label_style
+        c_lbl = self._col_label_style
+        i_row, i_col = self.row_col_id(i_facet)
 
         labels = []
 
@@ -433,64 +578,68 @@ class GridFaceter(AbstractFaceter):
                 self.rows_faceted() and
                 self.is_row_labeled(i_facet)
         ):
-            label_text = "\n".join(
-                [str(x) for x in
-                 self.levels.get("row").slice(
-                     i_row, 1).row(0)])
             labels.append(
-                {"text": label_text,
+                {"text": self.get_level_labels("row")[i_row],
                  "style": r_lbl})
 
         if (
                 self.cols_faceted() and
                 self.is_col_labeled(i_facet)
         ):
-            label_text = "\n".join(
-                [str(x) for x in
-                 self.levels.get("col").slice(
-                     i_col, 1).row(0)])
             labels.append(
-                {"text": label_text,
+                {"text": self.get_level_labels("col")[i_col],
                  "style": c_lbl})
         return labels
 
-    def is_row_labeled(self, i_facet):
+    def make_row_label_predicate(self):
+        """
+        Resolve which facets get row labels
+        to a predicate on facet id
+        """
         if (
                 not self.label or
                 not self.label_rows or
                 self.row_label_loc is None
         ):
-            result = False
-        elif self.label_rows == "left":
-            result = self.col_id(i_facet) == 0
-        elif self.label_rows == "right":
-            result = self.col_id(i_facet) == self.n_cols() - 1
-        elif (self.label_rows == "all"
-              or self.label_rows is True):
-            result = True
-        else:
-            result = False
-        return result
+            return _never
+        if self.label_rows is True:
+            return _always
+        predicates = {
+            "left": lambda i_facet: self.col_id(i_facet) == 0,
+            "right": lambda i_facet: (
+                self.col_id(i_facet) == self.n_cols() - 1),
+            "all": _always}
+        return predicates.get(self.label_rows, _never)
+
+    def make_col_label_predicate(self):
+        """
+        Resolve which facets get column labels
+        to a predicate on facet id
+        """
+        if (
+                not self.label or
+                not self.label_cols or
+                self.col_label_loc is None
+        ):
+            return _never
+        if self.label_cols is True:
+            return _always
+        predicates = {
+            "top": lambda i_facet: self.row_id(i_facet) == 0,
+            "bottom": lambda i_facet: (
+                self.row_id(i_facet) == self.n_rows() - 1),
+            "all": _always}
+        return predicates.get(self.label_cols, _never)
+
+    def is_row_labeled(self, i_facet):
+        return self._row_label_predicate(i_facet)
 
     def is_col_labeled(self, i_facet):
-        if not (self.label or
-                not self.label_cols or
-                self.col_label_loc is None):
-            result = False
-        elif self.label_cols == "top":
-            result = self.row_id(i_facet) == 0
-        elif self.label_cols == "bottom":
-            result = self.row_id(i_facet) == self.n_rows() - 1
-        elif (self.label_cols == "all" or
-              self.label_cols is True):
-            result = True
-        else:
-            result = False
-        return result
+        return self._col_label_predicate(i_facet)
 
 
 class WrapFaceter(AbstractFaceter):
-    facet_dimensions = set({"wrap"})
+    facet_dimensions = frozenset({"wrap"})
 
     def __init__(self,
                  *args,
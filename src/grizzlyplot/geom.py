@@ -6,9 +6,98 @@
 from grizzlyplot.scales import ScaleIdentity
 from grizzlyplot.stats import Stat, StatIdentity
 from grizzlyplot.position import Position, PositionIdentity
+from grizzlyplot.defaults import plot_defaults
+from grizzlyplot.profiling import render_profile
+from concurrent.futures import ThreadPoolExecutor
 import polars as pl
 import numpy as np
-from collections import namedtuple
+from collections import namedtuple, ChainMap
+
+
+# shared defaults, so that the common no-op
+# stat and position can be skipped with an
+# identity check
+_IDENTITY_STAT = StatIdentity()
+_IDENTITY_POSITION = PositionIdentity()
+
+
+def _scale_cache_key(aesthetic, scale, unscaled):
+    """
+    Hashable key for a single unscaled value,
+    or None if the value should not be cached
+    """
+    if isinstance(unscaled, np.ndarray):
+        if unscaled.size != 1:
+            return None
+        kind, value = unscaled.dtype.str, unscaled.item()
+    elif unscaled is None or isinstance(unscaled, (str, int, float)):
+        kind, value = type(unscaled), unscaled
+    else:
+        return None
+    return (aesthetic, id(scale), kind, value)
+
+
+def _all_equal_to_first(values):
+    """
+    Check that all entries of an array
+    equal its first entry
+    """
+    if values.size < 2:
+        return True
+    return bool(np.all(values[1:] == values[0]))
+
+
+def _validate_aesthetics(
+        aesthetics,
+        grouped_aesthetics,
+        required_aesthetics):
+    if not frozenset(grouped_aesthetics) <= frozenset(aesthetics):
+        raise ValueError(
+            "Attempt to specify grouped_aesthetics "
+            "that are not among the Geom's specified "
+            "aesthetics. Got:\n"
+            "aesthetics: {}\n"
+            "grouped_aesthetics: {}\n\n"
+            "".format(
+                aesthetics,
+                grouped_aesthetics))
+    if not frozenset(required_aesthetics) <= frozenset(aesthetics):
+        raise ValueError(
+            "Attempt to specify required_aesthetics "
+            "that are not among the Geom's specified "
+            "aesthetics. Got:\n"
+            "aesthetics: {}\n"
+            "required_aesthetics: {}\n\n"
+            "".format(
+                aesthetics,
+                required_aesthetics))
+
+
+def _root_columns(mapped_exprs):
+    """
+    Names of the columns read by a list of
+    mappings, or None if they cannot be
+    determined (e.g. for selectors or
+    column-free expressions such as pl.len())
+    """
+    columns = set()
+    for mapped_expr in mapped_exprs:
+        meta = _as_expr(mapped_expr).meta
+        roots = meta.root_names()
+        if meta.has_multiple_outputs() or len(roots) < 1:
+            return None
+        columns.update(roots)
+    return columns
+
+
+def _as_expr(mapped_expr):
+    """
+    Coerce a column name mapping
+    to a polars expression
+    """
+    if isinstance(mapped_expr, str):
+        mapped_expr = pl.col(mapped_expr)
+    return mapped_expr
 
 
 class Geom:
@@ -55,10 +144,28 @@ class Geom:
         from the provided Geom-level `params`,
         look for it in plot-level `params`?
     """
+    __slots__ = (
+        "data",
+        "mapping",
+        "inherit_data",
+        "inherit_mapping",
+        "inherit_params",
+        "stat",
+        "position",
+        "name",
+        "params",
+        "default_aesthetic_values",
+        "aesthetic_aliases",
+        "default_scales",
+        "_scale_cache",
+        "_render_params")
     aesthetics = frozenset()
     grouped_aesthetics = frozenset()
     legend_excluded_aesthetics = frozenset()
     required_aesthetics = frozenset()
+    # geoms that override render_all to draw
+    # every group at once should set this
+    draws_all_groups = False
 
     def __init__(
             self,
@@ -73,9 +180,9 @@ class Geom:
             **kwargs):
 
         if stat is None:
-            stat = StatIdentity()
+            stat = _IDENTITY_STAT
         if position is None:
-            position = PositionIdentity()
+            position = _IDENTITY_POSITION
 
         self.data = data
         self.mapping = mapping
@@ -86,6 +193,8 @@ class Geom:
         self.position = position
         self.name = name
         self.params = kwargs
+        self._scale_cache = None
+        self._render_params = None
 
         if not hasattr(self, "default_aesthetic_values"):
             self.default_aesthetic_values = {}
@@ -96,28 +205,25 @@ class Geom:
             self.default_scales = {aes: ScaleIdentity() for
                                    aes in self.aesthetics}
 
-        if not set(self.grouped_aesthetics).issubset(
-                set(self.aesthetics)):
-            raise ValueError(
-                "Attempt to specify grouped_aesthetics "
-                "that are not among the Geom's specified "
-                "aesthetics. Got:\n"
-                "aesthetics: {}\n"
-                "grouped_aesthetics: {}\n\n"
-                "".format(
-                    self.aesthetics,
-                    self.grouped_aesthetics))
-        if not set(self.required_aesthetics).issubset(
-                set(self.aesthetics)):
-            raise ValueError(
-                "Attempt to specify required_aesthetics "
-                "that are not among the Geom's specified "
-                "aesthetics. Got:\n"
-                "aesthetics: {}\n"
-                "required_aesthetics: {}\n\n"
-                "".format(
-                    self.aesthetics,
-                    self.required_aesthetics))
+        # geoms that set aesthetics per instance
+        # were not covered by the class-level check;
+        # slotted geoms cannot set them per instance
+        instance_attrs = getattr(self, "__dict__", {})
+        if any(attr in instance_attrs for attr in (
+                "aesthetics",
+                "grouped_aesthetics",
+                "required_aesthetics")):
+            _validate_aesthetics(
+                self.aesthetics,
+                self.grouped_aesthetics,
+                self.required_aesthetics)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _validate_aesthetics(
+            cls.aesthetics,
+            cls.grouped_aesthetics,
+            cls.required_aesthetics)
 
     def choose_data(
             self,
@@ -149,10 +255,12 @@ class Geom:
                 inherited_mapping = {
                     key: val for key, val in
                     inherited_mapping.items() if
-                    key not in self.params.keys()}
+                    key not in self.params}
             if self.mapping is not None:
-                mapping = dict(inherited_mapping,
-                               **self.mapping)
+                # read-only view; geom-level
+                # entries take priority
+                mapping = ChainMap(self.mapping,
+                                   inherited_mapping)
             else:
                 mapping = inherited_mapping
         else:
@@ -160,34 +268,89 @@ class Geom:
 
         return mapping
 
-    def get_groups(
+    def get_group_exprs(
             self,
-            data=None,
-            mapping=None):
+            mapping):
+        if mapping is None or (
+                not self.grouped_aesthetics and
+                "group" not in mapping
+        ):
+            return []
 
         mapped_exprs = [
-            mapping[aes] for aes in self.grouped_aesthetics
-            if aes in mapping.keys()
+            mapping[aes] for aes in
+            self.grouped_aesthetics & mapping.keys()
         ]
         additional_exprs = mapping.get("group", [])
 
         if type(additional_exprs) in [str, pl.Expr]:
             additional_exprs = [additional_exprs]
 
-        group_exprs = list(set(additional_exprs + mapped_exprs))
+        return list(set(additional_exprs + mapped_exprs))
 
+    def prepare_data(
+            self,
+            data,
+            sources,
+            group_exprs):
+        """
+        Narrow data to the columns that the mapped
+        aesthetics and grouping read, and sort it by
+        group, in a single lazy query
+        """
+        if data is None:
+            return data
+        query = data.lazy()
+        needed = _root_columns(
+            [source for is_mapped, source in sources.values()
+             if is_mapped] + group_exprs)
+        if needed is not None:
+            query = query.select(
+                [col for col in data.columns if col in needed])
         if len(group_exprs) > 0:
-            result = data.sort(
-                group_exprs
-            ).partition_by(
-                group_exprs,
-                maintain_order=True
-            )
+            query = query.sort(group_exprs)
+        return query.collect()
+
+    def get_groups(
+            self,
+            data=None,
+            mapping=None):
 
+        group_exprs = self.get_group_exprs(mapping)
+
+        if len(group_exprs) > 0:
+            result = list(self.split_sorted_groups(
+                data.sort(group_exprs),
+                group_exprs))
         else:
             result = [data]
         return result
 
+    def split_sorted_groups(
+            self,
+            sorted_data,
+            group_exprs):
+        """
+        Split data already sorted by group_exprs
+        into groups, as zero-copy slices
+        at the points where the group key changes.
+        Returns an iterator over the groups.
+        """
+        if sorted_data.height == 0:
+            return iter([])
+        keys = sorted_data.select(group_exprs)
+        key_changed = keys.select(
+            pl.any_horizontal([
+                pl.col(col).ne_missing(pl.col(col).shift(1))
+                for col in keys.columns])
+        ).to_series().to_numpy()
+        bounds = np.union1d(
+            [0, sorted_data.height],
+            np.flatnonzero(key_changed))
+        return (
+            sorted_data.slice(int(start), int(stop - start))
+            for start, stop in zip(bounds[:-1], bounds[1:]))
+
     def render(
             self,
             ax=None,
@@ -196,36 +359,209 @@ class Geom:
             inherited_mapping=None,
             inherited_params=None,
             scales=None):
+        profile = render_profile(self)
+
+        with profile.stage("data"):
+            data = self.choose_data(
+                data=data,
+                inherited_data=inherited_data)
+            comb_mapping = self.get_combined_mapping(
+                inherited_mapping=inherited_mapping)
+
+            # sources are the same for every group,
+            # so resolve them once per render
+            sources = self.get_aesthetic_sources(
+                self.aesthetics,
+                inherited_mapping,
+                inherited_params)
 
-        data = self.choose_data(
-            data=data,
-            inherited_data=inherited_data)
-        comb_mapping = self.get_combined_mapping(
-            inherited_mapping=inherited_mapping)
-
-        groups = self.get_groups(
-            data=data,
-            mapping=comb_mapping)
+            group_exprs = self.get_group_exprs(comb_mapping)
+            data = self.prepare_data(
+                data,
+                sources,
+                group_exprs)
+            if len(group_exprs) > 0:
+                groups = self.split_sorted_groups(
+                    data,
+                    group_exprs)
+            else:
+                groups = [data]
+
+        # groups often share values for grouped
+        # aesthetics, so memoize their scaling
+        # for the duration of this render
+        self._scale_cache = dict()
+        # plot params, for settings read while drawing
+        self._render_params = inherited_params
+        try:
+            group_render_values = self.iter_group_render_values(
+                groups,
+                scales=scales,
+                inherited_mapping=inherited_mapping,
+                inherited_params=inherited_params,
+                sources=sources)
+
+            if self.draws_all_groups:
+                with profile.stage("scale"):
+                    all_group_vals = list(group_render_values)
+                with profile.stage("draw"):
+                    for values in all_group_vals:
+                        self.validate_render_values(values)
+                    self.render_all(
+                        all_group_vals,
+                        scales=scales,
+                        ax=ax)
+            else:
+                while True:
+                    # scaling, stat and position
+                    with profile.stage("scale"):
+                        values = next(group_render_values, None)
+                    if values is None:
+                        break
+                    with profile.stage("draw"):
+                        self.validate_render_values(values)
+                        self.render_group(
+                            group_vals=values,
+                            scales=scales,
+                            ax=ax)
+        finally:
+            self._scale_cache = None
+            self._render_params = None
+        profile.report()
+
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        """
+        Draw the render values of every group.
+        Used instead of drawing group by group
+        when `draws_all_groups` is True; by
+        default falls back to :meth:`render_group`
+        """
+        for group_vals in all_group_vals:
+            self.render_group(
+                group_vals=group_vals,
+                scales=scales,
+                ax=ax)
 
-        group_scaled_values = [
-            self.get_scaled_values(
-                group_data,
+    def get_plot_param(self, param, inherited_params=None):
+        """
+        Get a rendering setting such as
+        group_workers: from the geom's params,
+        then the plot's, then plot_defaults.
+        While rendering, the plot's params
+        default to those passed to :meth:`render`.
+        """
+        if inherited_params is None:
+            inherited_params = self._render_params
+        if param in self.params:
+            return self.params[param]
+        if inherited_params is not None and param in inherited_params:
+            return inherited_params[param]
+        return plot_defaults[param]
+
+    def streams_groups(self, inherited_params=None):
+        """
+        Whether groups can be scaled, positioned,
+        and drawn one at a time, rather than
+        holding every group's values at once
+        """
+        return (
+            not self.stat.needs_all_groups and
+            not self.position.needs_all_groups and
+            self.get_plot_param(
+                "group_workers", inherited_params) is None)
+
+    def iter_group_render_values(
+            self,
+            groups,
+            scales=None,
+            inherited_mapping=None,
+            inherited_params=None,
+            sources=None):
+        """
+        Yield the render values of each group,
+        after scaling, stat, and position
+        """
+        if self.streams_groups(inherited_params):
+            aesthetic_scales = self.get_aesthetic_scales(
+                self.aesthetics,
+                scales)
+            for group_data in groups:
+                values = self.get_scaled_values(
+                    group_data,
+                    scales=scales,
+                    inherited_mapping=inherited_mapping,
+                    inherited_params=inherited_params,
+                    sources=sources,
+                    grouped=True,
+                    aesthetic_scales=aesthetic_scales)
+                if self.position is _IDENTITY_POSITION:
+                    yield values
+                else:
+                    yield from self.position([values], scales)
+        else:
+            group_scaled_values = self.get_group_scaled_values(
+                groups,
                 scales=scales,
                 inherited_mapping=inherited_mapping,
-                inherited_params=inherited_params)
-            for group_data in groups
-        ]
+                inherited_params=inherited_params,
+                sources=sources)
+            yield from self.position(
+                group_scaled_values,
+                scales)
 
-        group_render_values = self.position(
-            group_scaled_values,
+    def get_group_scaled_values(
+            self,
+            groups,
+            scales=None,
+            inherited_mapping=None,
+            inherited_params=None,
+            sources=None):
+        """
+        Get scaled values for each group and
+        apply the geom's stat to all groups
+        in one batch. If the group_workers
+        param is set, groups are scaled in
+        a thread pool,
+        unless one of the geom's scales is stateful
+        (for instance a categorical axis scale,
+        whose codes depend on call order).
+        """
+        groups = list(groups)
+        aesthetic_scales = self.get_aesthetic_scales(
+            self.aesthetics,
             scales)
 
-        for values in group_render_values:
-            self.validate_render_values(values)
-            self.render_group(
-                group_vals=values,
+        def prepare(group_data):
+            return self.get_scaled_values(
+                group_data,
                 scales=scales,
-                ax=ax)
+                inherited_mapping=inherited_mapping,
+                inherited_params=inherited_params,
+                sources=sources,
+                grouped=True,
+                apply_stat=False,
+                aesthetic_scales=aesthetic_scales)
+
+        n_workers = self.get_plot_param(
+            "group_workers", inherited_params)
+        parallel = (
+            n_workers is not None and
+            n_workers > 1 and
+            len(groups) > 1 and
+            not any(getattr(scale, "stateful", False)
+                    for scale in aesthetic_scales.values()))
+        if parallel:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                result = list(executor.map(prepare, groups))
+        else:
+            result = [prepare(group_data) for group_data in groups]
+        if self.stat is _IDENTITY_STAT:
+            return result
+        return self.stat.batch_apply(result, scales)
 
     def render_group(
             group_vals=None,
@@ -233,38 +569,142 @@ class Geom:
             ax=None):
         raise NotImplementedError()
 
-    def get_aesthetic_values(
+    def get_aesthetic_source(
             self,
             aesthetic,
-            data,
             inherited_mapping,
             inherited_params):
-
-        result = None
-
+        """
+        Find where the value of an aesthetic
+        comes from, in priority order: geom mapping,
+        geom params, inherited mapping, inherited params,
+        geom defaults.
+
+        Returns
+        -------
+        tuple
+            `(True, mapped_expr)` if the aesthetic
+            is mapped from data, otherwise
+            `(False, value)`.
+        """
         if (
                 self.mapping is not None and
-                aesthetic in self.mapping.keys()
+                aesthetic in self.mapping
         ):
-            mapped_expr = self.mapping[aesthetic]
-            selection = data.select(mapped_expr)
-            result = selection.to_series().to_numpy()
+            result = (True, self.mapping[aesthetic])
         elif (self.params is not None and
-              aesthetic in self.params.keys()):
-            result = self.params[aesthetic]
+              aesthetic in self.params):
+            result = (False, self.params[aesthetic])
         elif (inherited_mapping is not None and
-              aesthetic in inherited_mapping.keys() and
+              aesthetic in inherited_mapping and
               self.inherit_mapping):
-            mapped_expr = inherited_mapping[aesthetic]
-            selection = data.select(mapped_expr)
-            result = selection.to_series().to_numpy()
+            result = (True, inherited_mapping[aesthetic])
         elif (inherited_params is not None and
-              aesthetic in inherited_params.keys()
+              aesthetic in inherited_params
               and self.inherit_params):
-            result = inherited_params[aesthetic]
+            result = (False, inherited_params[aesthetic])
         else:
-            result = self.default_aesthetic_values.get(
-                aesthetic, None)
+            result = (False, self.default_aesthetic_values.get(
+                aesthetic, None))
+        return result
+
+    def get_aesthetic_sources(
+            self,
+            aesthetics,
+            inherited_mapping,
+            inherited_params):
+        return {
+            aes: self.get_aesthetic_source(
+                aes,
+                inherited_mapping,
+                inherited_params)
+            for aes in aesthetics}
+
+    def get_aesthetic_values(
+            self,
+            aesthetic,
+            data,
+            inherited_mapping,
+            inherited_params,
+            as_series=False):
+        """
+        Get the values of a single aesthetic.
+        Mapped values are returned as a numpy
+        array, or as the selected
+        :class:`polars.Series` if `as_series`
+        is True.
+        """
+        is_mapped, source = self.get_aesthetic_source(
+            aesthetic,
+            inherited_mapping,
+            inherited_params)
+        if is_mapped:
+            selection = data.select(_as_expr(source))
+            result = selection.to_series()
+            if not as_series:
+                result = result.to_numpy()
+        else:
+            result = source
+        return result
+
+    def get_aesthetics_values(
+            self,
+            aesthetics,
+            data,
+            inherited_mapping,
+            inherited_params,
+            sources=None,
+            first_only=frozenset()):
+        """
+        Get values for several aesthetics
+        at once, evaluating all data mappings
+        in a single :meth:`polars.DataFrame.select`.
+        Pre-resolved `sources` from
+        :meth:`get_aesthetic_sources` may be passed
+        to skip looking them up again. For mapped
+        aesthetics in `first_only`, only the first
+        value is fetched.
+        """
+        if sources is None:
+            sources = self.get_aesthetic_sources(
+                aesthetics,
+                inherited_mapping,
+                inherited_params)
+        result = {aes: source for aes, (is_mapped, source)
+                  in sources.items() if not is_mapped}
+        mapped = [aes for aes, (is_mapped, _) in sources.items()
+                  if is_mapped and aes not in first_only]
+        mapped_first = [aes for aes, (is_mapped, _) in sources.items()
+                        if is_mapped and aes in first_only]
+
+        # kept as separate selects since polars would
+        # broadcast first() to the full column height
+        if len(mapped) > 0:
+            # aesthetics mapped to the same column
+            # or expression object are evaluated once
+            keys = {
+                aes: (sources[aes][1]
+                      if isinstance(sources[aes][1], str)
+                      else id(sources[aes][1]))
+                for aes in mapped}
+            evaluated_as = dict()
+            for aes in mapped:
+                evaluated_as.setdefault(keys[aes], aes)
+            selection = data.select([
+                _as_expr(sources[aes][1]).alias(aes)
+                for aes in evaluated_as.values()])
+            for aes in evaluated_as.values():
+                result[aes] = selection.get_column(
+                    aes).to_numpy()
+            for aes in mapped:
+                result[aes] = result[evaluated_as[keys[aes]]]
+        if len(mapped_first) > 0:
+            selection = data.select([
+                _as_expr(sources[aes][1]).first().alias(aes)
+                for aes in mapped_first])
+            for aes in mapped_first:
+                result[aes] = selection.get_column(
+                    aes).to_numpy()
         return result
 
     def get_scaled_value(
@@ -274,17 +714,68 @@ class Geom:
             inherited_mapping,
             inherited_params,
             scales):
-        if scales is None:
-            raise ValueError("No scales provided")
-        scale = scales[aesthetic]
         unscaled = self.get_aesthetic_values(
             aesthetic,
             data,
             inherited_mapping,
             inherited_params)
-        if scale is None:
-            raise ValueError("No scale given for "
-                             "aesthetic {}".format(aesthetic))
+        return self.scale_aesthetic_value(
+            aesthetic,
+            unscaled,
+            scales)
+
+    def get_aesthetic_scales(
+            self,
+            aesthetics,
+            scales):
+        """
+        Look up and check the scale for
+        each of the given aesthetics
+        """
+        if scales is None:
+            raise ValueError("No scales provided")
+        result = {}
+        for aesthetic in aesthetics:
+            scale = scales[aesthetic]
+            if scale is None:
+                raise ValueError("No scale given for "
+                                 "aesthetic {}".format(aesthetic))
+            result[aesthetic] = scale
+        return result
+
+    def scale_aesthetic_value(
+            self,
+            aesthetic,
+            unscaled,
+            scales):
+        scale = self.get_aesthetic_scales(
+            [aesthetic], scales)[aesthetic]
+        return self.apply_aesthetic_scale(
+            aesthetic,
+            scale,
+            unscaled)
+
+    def apply_aesthetic_scale(
+            self,
+            aesthetic,
+            scale,
+            unscaled):
+        cache_key = None
+        if (
+                self._scale_cache is not None and
+                aesthetic in self.grouped_aesthetics
+        ):
+            cache_key = _scale_cache_key(aesthetic, scale, unscaled)
+            if cache_key in self._scale_cache:
+                return self._scale_cache[cache_key]
+
+        scaled = self._apply_scale(aesthetic, scale, unscaled)
+
+        if cache_key is not None:
+            self._scale_cache[cache_key] = scaled
+        return scaled
+
+    def _apply_scale(self, aesthetic, scale, unscaled):
         scaled = scale(unscaled)
         if (
                 scaled is not None and
@@ -293,7 +784,7 @@ class Geom:
         ):
             if isinstance(scaled, list):
                 scaled = np.array(scaled)
-            if not np.all(scaled == scaled[0]) == 1:
+            if not _all_equal_to_first(scaled):
                 print(scale)
                 print(scaled)
                 raise ValueError("For aesthetic {}, "
@@ -314,20 +805,52 @@ class Geom:
             data,
             scales=None,
             inherited_mapping=None,
-            inherited_params=None):
+            inherited_params=None,
+            sources=None,
+            grouped=False,
+            apply_stat=True,
+            aesthetic_scales=None):
+        """
+        Get scaled values for all of the geom's
+        aesthetics and, if `apply_stat` is True,
+        apply the geom's stat.
+        If `grouped` is True, the data is taken to
+        be a single group from :meth:`get_groups`,
+        so mapped grouped aesthetics are already
+        constant and only their first values are
+        scaled. Scales already looked up with
+        :meth:`get_aesthetic_scales` may be passed
+        as `aesthetic_scales`.
+        """
+        if aesthetic_scales is None:
+            aesthetic_scales = self.get_aesthetic_scales(
+                self.aesthetics,
+                scales)
+
+        if grouped:
+            first_only = self.grouped_aesthetics
+        else:
+            first_only = frozenset()
+
+        unscaled_values = self.get_aesthetics_values(
+            self.aesthetics,
+            data,
+            inherited_mapping,
+            inherited_params,
+            sources=sources,
+            first_only=first_only)
 
         scaled_values = {
-            aes: self.get_scaled_value(
+            aes: self.apply_aesthetic_scale(
                 aes,
-                data,
-                inherited_mapping,
-                inherited_params,
-                scales)
-            for aes in self.aesthetics}
+                aesthetic_scales[aes],
+                unscaled)
+            for aes, unscaled in unscaled_values.items()}
 
-        scaled_vals = self.stat(scaled_values, scales)
+        if apply_stat and self.stat is not _IDENTITY_STAT:
+            scaled_values = self.stat(scaled_values, scales)
 
-        return scaled_vals
+        return scaled_values
 
     def validate_render_values(self, render_vals):
         for aes in self.required_aesthetics:
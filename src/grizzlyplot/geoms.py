@@ -7,10 +7,270 @@ inheriting from base
 :class:`~grizzlyplot.geom.Geom`
 """
 
+import math
 import numpy as np
+import matplotlib as mpl
+from matplotlib.collections import LineCollection
 from grizzlyplot.geom import Geom
 import grizzlyplot.stats as stats
-from scipy.integrate import simpson
+
+
+# marker strings with which ax.plot draws no markers
+_NO_MARKERS = frozenset({"", " ", "None", "none"})
+
+
+# per-instance aesthetic sets of geoms
+# with a configurable support axis,
+# keyed by (class, support axis)
+_axes_variant_cache = dict()
+
+
+def _scalar(value):
+    """
+    Unwrap a single-entry array to a scalar,
+    leaving other values unchanged
+    """
+    if isinstance(value, np.ndarray) and value.size == 1:
+        return value.item()
+    return value
+
+
+def _artist_kwargs(group_vals):
+    """
+    rasterized and zorder keyword arguments
+    for an artist, leaving out unset values
+    so that matplotlib's defaults apply
+    """
+    return {key: group_vals[key]
+            for key in ["rasterized", "zorder"]
+            if group_vals[key] is not None}
+
+
+def _natural_rate(rate, base):
+    """
+    Convert a growth rate in the given
+    base to a rate in base e, skipping
+    the logarithm for the default base e
+    """
+    if np.ndim(base) == 0:
+        # avoid ufunc dispatch for scalars
+        if base == math.e:
+            return rate
+        return rate * math.log(base)
+    if np.all(base == np.e):
+        return rate
+    return rate * np.log(base)
+
+
+def _exponential_curves(
+        time_min,
+        time_max,
+        n_points,
+        intercept,
+        rate,
+        base):
+    """
+    Evaluate exponential curves at n_points
+    evenly spaced times. Parameters may be
+    arrays of the same shape, one entry per
+    curve; curves run along the last axis
+    of the returned times and values.
+    """
+    times = np.linspace(time_min, time_max, n_points, axis=-1)
+    # exponentiate and scale in place,
+    # without further temporaries
+    values = np.expand_dims(_natural_rate(rate, base), -1) * times
+    np.exp(values, out=values)
+    intercept = np.expand_dims(intercept, -1)
+    if np.broadcast_shapes(intercept.shape, values.shape) == values.shape:
+        values *= intercept
+    else:
+        values = intercept * values
+    return times, values
+
+
+def _bucket_by_style(all_group_vals, style_aesthetics):
+    """
+    Bucket groups by their values of the
+    given style aesthetics, in order of first
+    appearance. Returns None if a style value
+    is unhashable.
+    """
+    buckets = dict()
+    for group_vals in all_group_vals:
+        key = tuple(_scalar(group_vals[aes])
+                    for aes in style_aesthetics)
+        try:
+            buckets.setdefault(key, []).append(group_vals)
+        except TypeError:
+            return None
+    return buckets
+
+
+def _concat_broadcast(all_group_vals, aesthetics):
+    """
+    Broadcast the given aesthetics against
+    each other within each group and
+    concatenate them across groups
+    """
+    columns = zip(*[
+        np.broadcast_arrays(*[np.ravel(group_vals[aes])
+                              for aes in aesthetics])
+        for group_vals in all_group_vals])
+    return [np.concatenate(column) for column in columns]
+
+
+def _stack_errors(all_group_vals, aesthetic):
+    """
+    Stack the (lower, upper) errors of
+    single-point groups into a (2, N)
+    array, or None if no group has errors
+    """
+    errors = [group_vals[aesthetic]
+              for group_vals in all_group_vals]
+    if all(error is None for error in errors):
+        return None
+    return np.hstack([
+        np.zeros((2, 1)) if error is None
+        else np.reshape(error, (2, 1))
+        for error in errors])
+
+
+def _render_point_density(
+        ax,
+        xs,
+        ys,
+        color,
+        alpha):
+    """
+    Draw points as a raster of point
+    counts per bin, about one bin per
+    axes pixel, shaded from transparent
+    to the given color
+    """
+    xs = np.ravel(xs)
+    ys = np.ravel(ys)
+    finite = np.isfinite(xs) & np.isfinite(ys)
+    xs, ys = xs[finite], ys[finite]
+    if xs.size < 1:
+        return None
+    n_cols = max(int(ax.bbox.width), 1)
+    n_rows = max(int(ax.bbox.height), 1)
+    counts, x_edges, y_edges = np.histogram2d(
+        xs, ys, bins=[n_cols, n_rows])
+    image = np.empty((n_rows, n_cols, 4))
+    image[...] = mpl.colors.to_rgba(color, alpha)
+    image[..., 3] *= np.log1p(counts.T) / np.log1p(counts.max())
+    raster = ax.imshow(
+        image,
+        extent=(x_edges[0], x_edges[-1],
+                y_edges[0], y_edges[-1]),
+        origin="lower",
+        interpolation="nearest",
+        aspect="auto")
+    # imshow sets the view limits to the image
+    # extent; autoscale to all data instead,
+    # padding the limits as for markers
+    raster.sticky_edges.x.clear()
+    raster.sticky_edges.y.clear()
+    ax.autoscale_view()
+    return raster
+
+
+def _add_line_collection(
+        ax,
+        segments,
+        colors,
+        alphas,
+        linewidths,
+        linestyles="solid",
+        autolim=True,
+        **kwargs):
+    """
+    Draw line segments as a single
+    :class:`~matplotlib.collections.LineCollection`
+    styled to match lines drawn with `ax.plot`.
+    Other keyword arguments are passed to
+    the collection.
+    """
+    # ax.plot caps and joins solid and
+    # dashed lines differently
+    line_kind = "solid" if linestyles in ["solid", "-"] else "dash"
+    collection = LineCollection(
+        segments,
+        colors=[mpl.colors.to_rgba(color, alpha)
+                for color, alpha in zip(colors, alphas)],
+        linewidths=[
+            mpl.rcParams["lines.linewidth"] if lw is None else lw
+            for lw in linewidths],
+        linestyles=linestyles,
+        capstyle=mpl.rcParams["lines.{}_capstyle".format(line_kind)],
+        joinstyle=mpl.rcParams["lines.{}_joinstyle".format(line_kind)],
+        **kwargs)
+    ax.add_collection(collection, autolim=autolim)
+    return collection
+
+
+def _add_axis_spanning_lines(
+        ax,
+        axis,
+        intercepts,
+        lower_limits,
+        upper_limits,
+        color,
+        alpha,
+        lw,
+        ls):
+    """
+    Draw lines at data intercepts on the given
+    axis, spanning axes fractions along the other
+    axis, as one collection. Equivalent to repeated
+    :meth:`axhline` (axis="y") or :meth:`axvline`
+    (axis="x") calls, including their autoscaling.
+    """
+    if axis == "y":
+        get_bound = ax.get_ybound
+        transform = ax.get_yaxis_transform(which="grid")
+        segments = [[(low, y), (high, y)] for y, low, high
+                    in zip(intercepts, lower_limits, upper_limits)]
+    else:
+        get_bound = ax.get_xbound
+        transform = ax.get_xaxis_transform(which="grid")
+        segments = [[(x, low), (x, high)] for x, low, high
+                    in zip(intercepts, lower_limits, upper_limits)]
+    # axhline and axvline fall back to
+    # the Line2D defaults
+    if color is None:
+        color = mpl.rcParams["lines.color"]
+    if ls is None:
+        ls = mpl.rcParams["lines.linestyle"]
+    bound_low, bound_high = get_bound()
+    rescale = bool(np.any((intercepts < bound_low) |
+                          (intercepts > bound_high)))
+    n_lines = len(segments)
+    _add_line_collection(
+        ax,
+        segments,
+        colors=[color] * n_lines,
+        alphas=[alpha] * n_lines,
+        linewidths=[lw] * n_lines,
+        linestyles=ls,
+        autolim=False,
+        transform=transform,
+        # draw in the layer of ax.plot lines
+        zorder=mpl.lines.Line2D.zorder)
+    # only the data coordinate counts
+    # toward the data limits
+    points = np.zeros((n_lines, 2))
+    points[:, 1 if axis == "y" else 0] = intercepts
+    ax.update_datalim(
+        points,
+        updatex=(axis == "x"),
+        updatey=(axis == "y"))
+    if rescale:
+        ax.autoscale_view(
+            scalex=(axis == "x"),
+            scaley=(axis == "y"))
 
 
 class GeomXY(Geom):
@@ -40,6 +300,7 @@ class GeomXY(Geom):
         Geom-level aesthetic mappings take priority
         over plot-level ones if both are provided.
     """
+    __slots__ = ()
 
     aesthetics = frozenset({
         "x",
@@ -49,13 +310,12 @@ class GeomXY(Geom):
         "alpha",
         "lw",
         "markeredgecolor"})
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-        if aes not in ["x", "y"]])
+    grouped_aesthetics = aesthetics - {"x", "y"}
     legend_excluded_aesthetics = frozenset({
         "x", "y"})
     required_aesthetics = frozenset({
         "x", "y"})
+    draws_all_groups = True
 
     def render_group(
             self,
@@ -63,6 +323,15 @@ class GeomXY(Geom):
             scales=None,
             ax=None):
 
+        if self.draws_point_density(group_vals, ax):
+            _render_point_density(
+                ax,
+                group_vals["x"],
+                group_vals["y"],
+                color=_scalar(group_vals["color"]),
+                alpha=_scalar(group_vals["alpha"]))
+            return
+
         ax.plot(
             group_vals["x"],
             group_vals["y"],
@@ -72,24 +341,93 @@ class GeomXY(Geom):
             lw=group_vals["lw"],
             markeredgecolor=group_vals["markeredgecolor"])
 
+    def draws_point_density(self, group_vals, ax):
+        """
+        Whether to draw a group as a density raster
+        rather than as markers: only for unjoined
+        points on linear axes, when the group has
+        more points than the large_data_threshold
+        param
+        """
+        threshold = self.get_plot_param("large_data_threshold")
+        if threshold is None or np.size(group_vals["x"]) <= threshold:
+            return False
+        marker = _scalar(group_vals["marker"])
+        return (
+            _scalar(group_vals["lw"]) == 0 and
+            marker is not None and
+            not (isinstance(marker, str) and marker in _NO_MARKERS) and
+            _scalar(group_vals["color"]) is not None and
+            ax.get_xscale() == "linear" and
+            ax.get_yscale() == "linear" and
+            all(np.asarray(group_vals[aes]).dtype.kind in "biuf"
+                for aes in ["x", "y"]))
+
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        """
+        Draw the groups as a single line collection
+        when they are plain numeric lines with set
+        colors. Otherwise (markers, colors left to
+        the axes' color cycle, or non-numeric data
+        that needs matplotlib's unit handling)
+        draw group by group.
+        """
+        def is_plain_line(group_vals):
+            marker = _scalar(group_vals["marker"])
+            return (
+                (marker is None or (isinstance(marker, str) and
+                                    marker in _NO_MARKERS)) and
+                _scalar(group_vals["color"]) is not None and
+                all(np.asarray(group_vals[aes]).dtype.kind in "biuf"
+                    for aes in ["x", "y"]))
+
+        if not all(is_plain_line(group_vals)
+                   for group_vals in all_group_vals):
+            super().render_all(
+                all_group_vals,
+                scales=scales,
+                ax=ax)
+            return
+
+        _add_line_collection(
+            ax,
+            [np.column_stack([
+                np.ravel(group_vals["x"]),
+                np.ravel(group_vals["y"])])
+             for group_vals in all_group_vals],
+            colors=[_scalar(group_vals["color"])
+                    for group_vals in all_group_vals],
+            alphas=[_scalar(group_vals["alpha"])
+                    for group_vals in all_group_vals],
+            linewidths=[_scalar(group_vals["lw"])
+                        for group_vals in all_group_vals],
+            zorder=mpl.lines.Line2D.zorder)
+
 
 class GeomPoint(GeomXY):
+    __slots__ = ()
     default_aesthetic_values = {
         "marker": "o",
         "lw": 0}
 
 
 class GeomLine(GeomXY):
-    pass
+    __slots__ = ()
 
 
 class GeomPointLine(GeomXY):
+    __slots__ = ()
     default_aesthetic_values = {
         "marker": "o",
         "lw": 1}
 
 
 class GeomHLines(Geom):
+    __slots__ = ()
     aesthetics = frozenset({
         "yintercept",
         "xmin",
@@ -98,9 +436,7 @@ class GeomHLines(Geom):
         "alpha",
         "lw",
         "ls"})
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-    ])
+    grouped_aesthetics = aesthetics
 
     legend_excluded_aesthetics = frozenset([
         "yintercept",
@@ -119,6 +455,7 @@ class GeomHLines(Geom):
         "ls": "solid",
         "lw": 1,
         "alpha": 1}
+    draws_all_groups = True
 
     def render_group(
             self,
@@ -133,8 +470,39 @@ class GeomHLines(Geom):
                   lw=group_vals["lw"],
                   ls=group_vals["ls"])
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        """
+        Draw the lines with one :meth:`hlines`
+        call per combination of line styles
+        """
+        buckets = _bucket_by_style(
+            all_group_vals,
+            ["color", "alpha", "lw", "ls"])
+        if buckets is None:
+            super().render_all(
+                all_group_vals,
+                scales=scales,
+                ax=ax)
+            return
+        for (color, alpha, lw, ls), bucket in buckets.items():
+            ys, xmins, xmaxs = _concat_broadcast(
+                bucket,
+                ["yintercept", "xmin", "xmax"])
+            ax.hlines(y=ys,
+                      xmin=xmins,
+                      xmax=xmaxs,
+                      color=color,
+                      alpha=alpha,
+                      lw=lw,
+                      ls=ls)
+
 
 class GeomAxHLines(Geom):
+    __slots__ = ()
 
     aesthetics = frozenset({
         "yintercept",
@@ -145,9 +513,7 @@ class GeomAxHLines(Geom):
         "lw",
         "ls"})
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-    ])
+    grouped_aesthetics = aesthetics
 
     legend_excluded_aesthetics = frozenset({
         "yintercept",
@@ -166,6 +532,7 @@ class GeomAxHLines(Geom):
         "alpha": 1,
         "left_limit": 0,
         "right_limit": 1}
+    draws_all_groups = True
 
     def render_group(
             self,
@@ -180,8 +547,45 @@ class GeomAxHLines(Geom):
                    lw=group_vals["lw"],
                    ls=group_vals["ls"])
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        """
+        Draw the lines as one collection per
+        combination of line styles, as
+        :meth:`axhline` would draw them
+        """
+        buckets = _bucket_by_style(
+            all_group_vals,
+            ["color", "alpha", "lw", "ls"])
+        if buckets is None or not all(
+                np.asarray(group_vals["yintercept"]).dtype.kind
+                in "biuf" for group_vals in all_group_vals):
+            super().render_all(
+                all_group_vals,
+                scales=scales,
+                ax=ax)
+            return
+        for (color, alpha, lw, ls), bucket in buckets.items():
+            intercepts, lows, highs = _concat_broadcast(
+                bucket,
+                ["yintercept", "left_limit", "right_limit"])
+            _add_axis_spanning_lines(
+                ax,
+                "y",
+                intercepts,
+                lows,
+                highs,
+                color=color,
+                alpha=alpha,
+                lw=lw,
+                ls=ls)
+
 
 class GeomVLines(Geom):
+    __slots__ = ()
 
     aesthetics = frozenset({
         "xintercept",
@@ -192,9 +596,7 @@ class GeomVLines(Geom):
         "lw",
         "ls"})
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-    ])
+    grouped_aesthetics = aesthetics
 
     required_aesthetics = frozenset({
         "xintercept",
@@ -213,6 +615,7 @@ class GeomVLines(Geom):
         "ls": "solid",
         "lw": 1,
         "alpha": 1}
+    draws_all_groups = True
 
     def render_group(
             self,
@@ -227,8 +630,39 @@ class GeomVLines(Geom):
                   lw=group_vals["lw"],
                   ls=group_vals["ls"])
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        """
+        Draw the lines with one :meth:`vlines`
+        call per combination of line styles
+        """
+        buckets = _bucket_by_style(
+            all_group_vals,
+            ["color", "alpha", "lw", "ls"])
+        if buckets is None:
+            super().render_all(
+                all_group_vals,
+                scales=scales,
+                ax=ax)
+            return
+        for (color, alpha, lw, ls), bucket in buckets.items():
+            xs, ymins, ymaxs = _concat_broadcast(
+                bucket,
+                ["xintercept", "ymin", "ymax"])
+            ax.vlines(x=xs,
+                      ymin=ymins,
+                      ymax=ymaxs,
+                      color=color,
+                      alpha=alpha,
+                      lw=lw,
+                      ls=ls)
+
 
 class GeomAxVLines(Geom):
+    __slots__ = ()
     aesthetics = frozenset({
         "xintercept",
         "bottom_limit",
@@ -239,9 +673,7 @@ class GeomAxVLines(Geom):
         "ls"
     })
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-    ])
+    grouped_aesthetics = aesthetics
 
     required_aesthetics = frozenset({
         "xintercept"
@@ -260,6 +692,7 @@ class GeomAxVLines(Geom):
         "alpha": 1,
         "bottom_limit": 0,
         "top_limit": 1}
+    draws_all_groups = True
 
     def render_group(
             self,
@@ -275,8 +708,45 @@ class GeomAxVLines(Geom):
             lw=group_vals["lw"],
             ls=group_vals["ls"])
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        """
+        Draw the lines as one collection per
+        combination of line styles, as
+        :meth:`axvline` would draw them
+        """
+        buckets = _bucket_by_style(
+            all_group_vals,
+            ["color", "alpha", "lw", "ls"])
+        if buckets is None or not all(
+                np.asarray(group_vals["xintercept"]).dtype.kind
+                in "biuf" for group_vals in all_group_vals):
+            super().render_all(
+                all_group_vals,
+                scales=scales,
+                ax=ax)
+            return
+        for (color, alpha, lw, ls), bucket in buckets.items():
+            intercepts, lows, highs = _concat_broadcast(
+                bucket,
+                ["xintercept", "bottom_limit", "top_limit"])
+            _add_axis_spanning_lines(
+                ax,
+                "x",
+                intercepts,
+                lows,
+                highs,
+                color=color,
+                alpha=alpha,
+                lw=lw,
+                ls=ls)
+
 
 class GeomExponential(Geom):
+    __slots__ = ()
 
     legend_excluded_aesthetics = frozenset({
         "rate",
@@ -292,6 +762,7 @@ class GeomExponential(Geom):
         "n_points": 100,
         "base": np.exp(1)
     }
+    draws_all_groups = True
 
     def render_group(
             self,
@@ -310,16 +781,14 @@ class GeomExponential(Geom):
                 "or time_axis='y'".format(
                     time_axis))
 
-        times = np.linspace(
+        times, values = _exponential_curves(
             group_vals[time_axis + "min"],
             group_vals[time_axis + "max"],
-            group_vals["n_points"])
-        log_intercept = np.log(
-            group_vals[value_axis + "intercept"])
-        values = np.exp(
-            log_intercept +
-            np.log(group_vals["base"]) *
-            group_vals["rate"] * times).flatten()
+            group_vals["n_points"],
+            group_vals[value_axis + "intercept"],
+            group_vals["rate"],
+            group_vals["base"])
+        times, values = times.flatten(), values.flatten()
         if time_axis == "x":
             xs, ys = times, values
         elif time_axis == "y":
@@ -338,8 +807,97 @@ class GeomExponential(Geom):
             alpha=group_vals["alpha"],
             lw=group_vals["lw"])
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None,
+            time_axis=None):
+        """
+        Evaluate the curves of all groups with
+        a single broadcast over groups sharing a
+        number of points, and draw them as one
+        line collection. Falls back to drawing
+        group by group if any group has markers,
+        an unset color (left to the axes' color
+        cycle), or non-scalar parameters.
+        """
+        if time_axis == "x":
+            value_axis = "y"
+        elif time_axis == "y":
+            value_axis = "x"
+        else:
+            raise ValueError(
+                "Unknown time_axis {}."
+                "Must specify time_axis='x'"
+                "or time_axis='y'".format(
+                    time_axis))
+        curve_aesthetics = [
+            time_axis + "min",
+            time_axis + "max",
+            value_axis + "intercept",
+            "rate",
+            "base",
+            "n_points",
+            "lw",
+            "alpha"]
+        params = [
+            {aes: _scalar(group_vals[aes])
+             for aes in curve_aesthetics}
+            for group_vals in all_group_vals]
+        if any(_scalar(group_vals["marker"]) is not None or
+               _scalar(group_vals["color"]) is None
+               for group_vals in all_group_vals) or not all(
+                   np.isscalar(value) for group_params in params
+                   for value in group_params.values()):
+            for group_vals in all_group_vals:
+                GeomExponential.render_group(
+                    self,
+                    group_vals=group_vals,
+                    scales=scales,
+                    ax=ax,
+                    time_axis=time_axis)
+            return
+
+        by_n_points = dict()
+        for i_group, group_params in enumerate(params):
+            by_n_points.setdefault(
+                int(group_params["n_points"]), []).append(i_group)
+
+        segments = [None] * len(params)
+        for n_points, i_groups in by_n_points.items():
+            def param_array(aes):
+                return np.array(
+                    [params[i][aes] for i in i_groups],
+                    dtype="float")
+            times, values = _exponential_curves(
+                param_array(time_axis + "min"),
+                param_array(time_axis + "max"),
+                n_points,
+                param_array(value_axis + "intercept"),
+                param_array("rate"),
+                param_array("base"))
+            if time_axis == "x":
+                curves = np.stack([times, values], axis=-1)
+            else:
+                curves = np.stack([values, times], axis=-1)
+            for i_group, curve in zip(i_groups, curves):
+                segments[i_group] = curve
+
+        _add_line_collection(
+            ax,
+            segments,
+            colors=[_scalar(group_vals["color"])
+                    for group_vals in all_group_vals],
+            alphas=[group_params["alpha"]
+                    for group_params in params],
+            linewidths=[group_params["lw"]
+                        for group_params in params],
+            zorder=mpl.lines.Line2D.zorder)
+
 
 class GeomExponentialX(GeomExponential):
+    __slots__ = ()
     aesthetics = frozenset({
         "rate",
         "yintercept",
@@ -362,9 +920,7 @@ class GeomExponentialX(GeomExponential):
         "base"
     })
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-    ])
+    grouped_aesthetics = aesthetics
 
     def render_group(
             self,
@@ -377,8 +933,20 @@ class GeomExponentialX(GeomExponential):
             ax=ax,
             time_axis="x")
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        super().render_all(
+            all_group_vals,
+            scales=scales,
+            ax=ax,
+            time_axis="x")
+
 
 class GeomExponentialY(GeomExponential):
+    __slots__ = ()
     aesthetics = frozenset({
         "rate",
         "xintercept",
@@ -400,9 +968,7 @@ class GeomExponentialY(GeomExponential):
         "base"
     })
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-    ])
+    grouped_aesthetics = aesthetics
 
     def render_group(
             self,
@@ -415,8 +981,20 @@ class GeomExponentialY(GeomExponential):
             ax=ax,
             time_axis="y")
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        super().render_all(
+            all_group_vals,
+            scales=scales,
+            ax=ax,
+            time_axis="y")
+
 
 class GeomPointInterval(Geom):
+    __slots__ = ()
     aesthetics = frozenset({
         "x",
         "y",
@@ -429,9 +1007,7 @@ class GeomPointInterval(Geom):
         "markeredgewidth",
         "markerfacecolor"})
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-        if aes not in ["x", "y"]])
+    grouped_aesthetics = aesthetics - {"x", "y"}
 
     required_aesthetics = frozenset({
         "x",
@@ -447,6 +1023,16 @@ class GeomPointInterval(Geom):
         "markeredgewidth": 0.5,
         "markerfacecolor": None
     }
+    draws_all_groups = True
+    style_aesthetics = [
+        "color",
+        "marker",
+        "alpha",
+        "lw",
+        "markersize",
+        "markeredgecolor",
+        "markeredgewidth",
+        "markerfacecolor"]
 
     def __init__(self,
                  stat=None,
@@ -475,17 +1061,50 @@ class GeomPointInterval(Geom):
                     markeredgewidth=group_vals["markeredgewidth"],
                     markerfacecolor=group_vals["markerfacecolor"])
 
+    def render_all(
+            self,
+            all_group_vals,
+            scales=None,
+            ax=None):
+        """
+        Draw the point intervals with one
+        :meth:`errorbar` call per combination
+        of styles. Points are not joined by
+        lines, as when drawn one group at a time.
+        Groups that leave their color to the
+        axes' color cycle are drawn one at a time.
+        """
+        buckets = _bucket_by_style(
+            all_group_vals,
+            self.style_aesthetics)
+        if buckets is None or not all(
+                _scalar(group_vals["color"]) is not None and
+                np.size(group_vals["x"]) == 1 and
+                np.size(group_vals["y"]) == 1
+                for group_vals in all_group_vals):
+            super().render_all(
+                all_group_vals,
+                scales=scales,
+                ax=ax)
+            return
+        for style, bucket in buckets.items():
+            xs, ys = _concat_broadcast(bucket, ["x", "y"])
+            ax.errorbar(xs,
+                        ys,
+                        xerr=_stack_errors(bucket, "xerr"),
+                        yerr=_stack_errors(bucket, "yerr"),
+                        ls="none",
+                        **dict(zip(self.style_aesthetics, style)))
+
 
 class GeomPointIntervalX(GeomPointInterval):
-    grouped_aesthetics = frozenset([
-        aes for aes in GeomPointInterval.aesthetics
-        if aes not in ["x"]])
+    __slots__ = ()
+    grouped_aesthetics = GeomPointInterval.aesthetics - {"x"}
 
 
 class GeomPointIntervalY(GeomPointInterval):
-    grouped_aesthetics = frozenset([
-        aes for aes in GeomPointInterval.aesthetics
-        if aes not in ["y"]])
+    __slots__ = ()
+    grouped_aesthetics = GeomPointInterval.aesthetics - {"y"}
 
 
 class GeomDensity(Geom):
@@ -498,11 +1117,11 @@ class GeomDensity(Geom):
         "ls",
         "lw",
         "support",
-        "density"})
+        "density",
+        "rasterized",
+        "zorder"})
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-        if aes not in ["support", "density"]])
+    grouped_aesthetics = aesthetics - {"support", "density"}
 
     required_aesthetics = frozenset()
 
@@ -511,7 +1130,12 @@ class GeomDensity(Geom):
         "marker": None,
         "lw": 1,
         "ls": "solid",
-        "linealpha": 1}
+        "linealpha": 1,
+        # rasterized=True keeps vector output
+        # (PDF, SVG) small for finely sampled
+        # densities
+        "rasterized": False,
+        "zorder": None}
 
     def __init__(
             self,
@@ -528,14 +1152,26 @@ class GeomDensity(Geom):
             raise ValueError(
                 "Unknown support axis "
                 "{}".format(support_axis))
-        self.aesthetics = frozenset(
-            list(self.aesthetics) + [self.support_axis])
-        self.required_aesthetics = frozenset(
-            list(self.required_aesthetics) +
-            [support_axis])
+        (self.aesthetics,
+         self.required_aesthetics) = self._get_axes_variant(
+             support_axis)
         super().__init__(stat=stat,
                          **kwargs)
 
+    @classmethod
+    def _get_axes_variant(cls, support_axis):
+        """
+        Aesthetics and required aesthetics
+        for a support axis, built once per
+        class and support axis
+        """
+        key = (cls, support_axis)
+        if key not in _axes_variant_cache:
+            _axes_variant_cache[key] = (
+                cls.aesthetics | {support_axis},
+                cls.required_aesthetics | {support_axis})
+        return _axes_variant_cache[key]
+
     def render_group(
             self,
             group_vals=None,
@@ -564,12 +1200,14 @@ class GeomDensity(Geom):
             color=group_vals["linecolor"],
             alpha=group_vals["linealpha"],
             lw=group_vals["lw"],
-            ls=group_vals["ls"])
+            ls=group_vals["ls"],
+            **_artist_kwargs(group_vals))
         fill_func(
             group_vals["support"],
             group_vals["density"],
             color=group_vals["fillcolor"],
-            alpha=group_vals["fillalpha"])
+            alpha=group_vals["fillalpha"],
+            **_artist_kwargs(group_vals))
 
 
 class GeomViolin(Geom):
@@ -583,13 +1221,13 @@ class GeomViolin(Geom):
         "lw",
         "support",
         "density",
+        "rasterized",
+        "zorder",
         "violinwidth",
         "norm",
         "trimtails"})
 
-    grouped_aesthetics = frozenset([
-        aes for aes in aesthetics
-        if aes not in ["support", "density"]])
+    grouped_aesthetics = aesthetics - {"support", "density"}
 
     required_aesthetics = frozenset()
 
@@ -603,7 +1241,12 @@ class GeomViolin(Geom):
         "fillalpha": 1,
         "norm": "area",
         "violinwidth": 1,
-        "trimtails": 0}
+        "trimtails": 0,
+        # rasterized=True keeps vector output
+        # (PDF, SVG) small for finely sampled
+        # densities
+        "rasterized": False,
+        "zorder": None}
 
     def __init__(
             self,
@@ -623,23 +1266,41 @@ class GeomViolin(Geom):
         else:
             raise ValueError("Unknown support axis "
                              "{}".format(support_axis))
-        axes = [self.support_axis, self.position_axis]
-        self.aesthetics = frozenset(
-            list(self.aesthetics) + axes)
-        self.required_aesthetics = frozenset(
-            list(self.required_aesthetics) +
-            axes)
-        self.grouped_aesthetics = frozenset(
-            list(self.grouped_aesthetics) +
-            [self.position_axis])
+        (self.aesthetics,
+         self.required_aesthetics,
+         self.grouped_aesthetics) = self._get_axes_variant(
+             self.support_axis,
+             self.position_axis)
         super().__init__(stat=stat,
                          **kwargs)
 
+    @classmethod
+    def _get_axes_variant(cls, support_axis, position_axis):
+        """
+        Aesthetics, required aesthetics, and
+        grouped aesthetics for a support axis,
+        built once per class and support axis
+        """
+        key = (cls, support_axis)
+        if key not in _axes_variant_cache:
+            axes = {support_axis, position_axis}
+            _axes_variant_cache[key] = (
+                cls.aesthetics | axes,
+                cls.required_aesthetics | axes,
+                cls.grouped_aesthetics | {position_axis})
+        return _axes_variant_cache[key]
+
     def transform_density(self,
                           density,
                           transformed_support,
                           norm,
                           violinwidth):
+        """
+        Scale a density to violin half-widths.
+        Returns the half-widths and their peak,
+        or None for the peak if the transform
+        did not compute it along the way.
+        """
         if norm == "area":
             return self.area_transform(density,
                                        transformed_support,
@@ -655,11 +1316,21 @@ class GeomViolin(Geom):
                        density,
                        transformed_support,
                        violinwidth):
-        return (0.5 * violinwidth * density /
-                simpson(density, transformed_support))
+        # trapezoid rule; densities are sampled
+        # on a grid fine enough that Simpson's
+        # rule adds nothing visible
+        area = 0.5 * np.sum(
+            (density[1:] + density[:-1]) *
+            np.diff(transformed_support))
+        return 0.5 * violinwidth * density / area, None
 
     def max_transform(self, density, violinwidth):
-        return 0.5 * violinwidth * density / np.max(density)
+        density_max = np.max(density)
+        # same operations as for the
+        # elementwise result, so the peak
+        # matches its maximum exactly
+        return (0.5 * violinwidth * density / density_max,
+                0.5 * violinwidth * density_max / density_max)
 
     def render_group(
             self,
@@ -670,19 +1341,24 @@ class GeomViolin(Geom):
         trans_support = ax_scale.transform(
             group_vals["support"])
 
-        dens_delta = self.transform_density(
+        dens_delta, dens_peak = self.transform_density(
             group_vals["density"],
             trans_support,
             group_vals["norm"],
             group_vals["violinwidth"]
         )
 
-        trim_mask = dens_delta > (
-            group_vals["trimtails"] *
-            np.max(dens_delta))
-
-        dens_delta = dens_delta[trim_mask]
-        trimmed_support = group_vals["support"][trim_mask]
+        if group_vals["trimtails"] or not np.min(dens_delta) > 0:
+            if dens_peak is None:
+                dens_peak = np.max(dens_delta)
+            trim_mask = dens_delta > (
+                group_vals["trimtails"] *
+                dens_peak)
+            dens_delta = dens_delta[trim_mask]
+            trimmed_support = group_vals["support"][trim_mask]
+        else:
+            # nothing to trim
+            trimmed_support = group_vals["support"]
 
         dens_plus = (
             group_vals[self.position_axis] +
@@ -710,23 +1386,36 @@ class GeomViolin(Geom):
                 "Unknown support "
                 "axis {}".format(self.support_axis))
 
-        ax.plot(
-            xs_plus, ys_plus,
-            marker=group_vals["marker"],
-            color=group_vals["linecolor"],
-            alpha=group_vals["linealpha"],
-            lw=group_vals["lw"],
-            ls=group_vals["ls"])
-        ax.plot(
-            xs_minus, ys_minus,
-            marker=group_vals["marker"],
-            color=group_vals["linecolor"],
-            alpha=group_vals["linealpha"],
-            lw=group_vals["lw"],
-            ls=group_vals["ls"])
+        if group_vals["marker"] is None:
+            # both outlines as one artist
+            _add_line_collection(
+                ax,
+                [np.column_stack([xs_plus, ys_plus]),
+                 np.column_stack([xs_minus, ys_minus])],
+                colors=[group_vals["linecolor"]] * 2,
+                alphas=[group_vals["linealpha"]] * 2,
+                linewidths=[group_vals["lw"]] * 2,
+                linestyles=group_vals["ls"],
+                rasterized=group_vals["rasterized"],
+                # draw in the layer of ax.plot lines
+                zorder=(mpl.lines.Line2D.zorder
+                        if group_vals["zorder"] is None
+                        else group_vals["zorder"]))
+        else:
+            for xs, ys in [(xs_plus, ys_plus),
+                           (xs_minus, ys_minus)]:
+                ax.plot(
+                    xs, ys,
+                    marker=group_vals["marker"],
+                    color=group_vals["linecolor"],
+                    alpha=group_vals["linealpha"],
+                    lw=group_vals["lw"],
+                    ls=group_vals["ls"],
+                    **_artist_kwargs(group_vals))
         fill_func(
             trimmed_support,
             dens_plus,
             dens_minus,
             color=group_vals["fillcolor"],
-            alpha=group_vals["fillalpha"])
+            alpha=group_vals["fillalpha"],
+            **_artist_kwargs(group_vals))
@@ -6,18 +6,49 @@ Base :class:`GrizzlyPlot` class, which
 is used to specify plots for rendering
 """
 
+from collections import ChainMap
+
 import numpy as np
 import polars as pl
 
 from grizzlyplot.faceter import (
     AbstractFaceter, GridFaceter, WrapFaceter, NullFaceter)
 from grizzlyplot.defaults import plot_defaults
+from grizzlyplot.profiling import render_profile
 from grizzlyplot.transforms import (
     dynamic_xspan_transform,
     dynamic_yspan_transform
 )
 
 
+def _freeze(value):
+    """
+    Snapshot the contents of nested
+    lists, tuples and dicts
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item))
+                     for key, item in value.items())
+    return value
+
+
+def _unchanged(old, new):
+    """
+    Compare snapshots from :func:`_freeze`,
+    matching strings and numbers by value and
+    any other objects by identity
+    """
+    if isinstance(old, tuple):
+        return (isinstance(new, tuple) and
+                len(old) == len(new) and
+                all(_unchanged(o, n) for o, n in zip(old, new)))
+    if isinstance(old, (str, int, float)):
+        return type(old) is type(new) and old == new
+    return old is new
+
+
 class GrizzlyPlot:
     """
     GrizzlyPlot class
@@ -128,6 +159,9 @@ class GrizzlyPlot:
         self.faceter = faceter
         self.impute_faceting = impute_faceting
         self.params = kwargs
+        self._collated_scales = None
+        self._faceter_state = None
+        self._cached_faceter = None
 
     def get_param(self, param, default=None):
         if default is None:
@@ -137,11 +171,8 @@ class GrizzlyPlot:
             param, default)
 
     def get_rendered_aesthetics(self):
-        aes = []
-        for geom in self.geoms:
-            aes += geom.aesthetics
-        result = list(set(aes))
-        return result
+        return list({aes for geom in self.geoms
+                     for aes in geom.aesthetics})
 
     def get_aesthetic_scale(self, aesthetic):
         result = None
@@ -166,8 +197,8 @@ class GrizzlyPlot:
                                  "".format(aesthetic))
             else:
                 first = candidates[0]
-                if not all([cand == first for
-                            cand in candidates]):
+                if not all(cand == first for
+                           cand in candidates):
                     raise ValueError("No scale specified "
                                      "for mapped aesthetic "
                                      "{} and clashing default "
@@ -182,7 +213,7 @@ class GrizzlyPlot:
         return result
 
     def get_all_aesthetic_values(self, aesthetic):
-        all_vals = []
+        chunks = []
         for geom in self.geoms:
             if aesthetic in geom.aesthetics:
                 dat = geom.choose_data(
@@ -196,68 +227,107 @@ class GrizzlyPlot:
                 if vals is not None:
                     if isinstance(vals, (str, float, int)):
                         vals = [vals]
-                    else:
-                        vals = list(np.unique(vals))
-                    all_vals += vals
+                    chunks.append(
+                        pl.Series(np.ravel(vals)).to_frame("value"))
                 pass
             pass
 
-        return np.unique(all_vals)
+        if len(chunks) < 1:
+            return np.unique([])
+        # hash-based unique, sorted to
+        # match np.unique
+        return pl.concat(
+            chunks,
+            how="vertical_relaxed"
+        ).to_series().unique().sort().to_numpy()
+
+    def get_collated_scales(self):
+        """
+        Get the scale for each rendered
+        aesthetic, reusing the previous result
+        while the geoms and scales are unchanged
+        """
+        geoms = tuple(self.geoms)
+        scales = tuple(self.scales.items())
+        cached = self._collated_scales
+        if (
+                cached is None or
+                len(cached[0]) != len(geoms) or
+                len(cached[1]) != len(scales) or
+                not all(old is new for old, new
+                        in zip(cached[0], geoms)) or
+                not all(old[0] == new[0] and old[1] is new[1]
+                        for old, new in zip(cached[1], scales))
+        ):
+            rendered_aes = self.get_rendered_aesthetics()
+            cached = (geoms, scales, {
+                aes: self.get_aesthetic_scale(aes)
+                for aes in rendered_aes})
+            self._collated_scales = cached
+        return cached[2]
 
     def initialize_scales(self, ax=None):
-        rendered_aes = self.get_rendered_aesthetics()
-        collated_scales = {aes: self.get_aesthetic_scale(aes)
-                           for aes in rendered_aes}
+        collated_scales = self.get_collated_scales()
         return {aes: scale.initialize(ax=ax)
                 for aes, scale in collated_scales.items()}
 
     def render(self, ax=None, fig=None, **kwargs):
-        faceter = self.get_faceter()
-        n_facets = faceter.n_facets()
+        profile = render_profile(self.__class__.__name__)
 
-        fig, ax = faceter.get_axes(
-            ax=ax,
-            fig=fig,
-            **kwargs)
-
-        scales = self.initialize_scales(ax=ax)
-
-        for i_facet in range(n_facets):
-            self.render_facet(
-                faceter,
-                i_facet,
-                scales=scales,
-                ax=ax[i_facet])
+        with profile.stage("faceting"):
+            faceter = self.get_faceter()
+            n_facets = faceter.n_facets()
 
+            fig, ax = faceter.get_axes(
+                ax=ax,
+                fig=fig,
+                **kwargs)
+
+            partitions = dict()
+            for data in [self.data] + [
+                    geom.data for geom in self.geoms]:
+                if id(data) not in partitions:
+                    partitions[id(data)] = faceter.partition(data)
+
+        with profile.stage("scales"):
+            scales = self.initialize_scales(ax=ax)
+
+        with profile.stage("facets"):
+            for i_facet in range(n_facets):
+                self.render_facet(
+                    faceter,
+                    i_facet,
+                    scales=scales,
+                    ax=ax[i_facet],
+                    partitions=partitions)
+
+        params = ChainMap(self.params, plot_defaults)
         if (
-                "xlabel" in self.params.keys() or
-                self.get_param("autolabel_xaxis")
+                "xlabel" in self.params or
+                params.get("autolabel_xaxis")
         ):
             fig.supxlabel(
-                self.get_param(
+                self.params.get(
                     "xlabel",
-                    default=self.mapping.get("x", None)),
-                x=self.get_param(
-                    "xaxis_label_x"),
-                y=self.get_param(
-                    "xaxis_label_y"),
+                    self.mapping.get("x", None)),
+                x=params.get("xaxis_label_x"),
+                y=params.get("xaxis_label_y"),
                 transform=dynamic_xspan_transform(
                     fig, ax))
         if (
-                "ylabel" in self.params.keys() or
-                self.get_param("autolabel_yaxis")
+                "ylabel" in self.params or
+                params.get("autolabel_yaxis")
         ):
             fig.supylabel(
-                self.get_param(
+                self.params.get(
                     "ylabel",
-                    default=self.mapping.get("y", None)),
-                x=self.get_param(
-                    "yaxis_label_x"),
-                y=self.get_param(
-                    "yxaxis_label_y"),
+                    self.mapping.get("y", None)),
+                x=params.get("yaxis_label_x"),
+                y=params.get("yaxis_label_y"),
                 transform=dynamic_yspan_transform(
                     fig, ax))
 
+        profile.report()
         return (fig, ax)
 
     def impute_faceter(self):
@@ -331,6 +401,31 @@ class GrizzlyPlot:
         return faceter
 
     def get_faceter(self):
+        """
+        Get the faceter for the plot, with
+        levels added from all of its data. The
+        faceter is reused until the faceting
+        arguments or data change.
+        """
+        state = _freeze((
+            self.faceter,
+            self.impute_faceting,
+            self.facet,
+            [(data, None if data is None else data.height)
+             for data in [self.data] + [
+                 geom.data for geom in self.geoms]]))
+        if (
+                self._cached_faceter is not None and
+                _unchanged(self._faceter_state, state)
+        ):
+            return self._cached_faceter
+
+        faceter = self.build_faceter()
+        self._faceter_state = state
+        self._cached_faceter = faceter
+        return faceter
+
+    def build_faceter(self):
 
         if self.faceter is not None:
             if isinstance(self.faceter, str):
@@ -387,16 +482,30 @@ class GrizzlyPlot:
             faceter,
             i_facet,
             scales=None,
-            ax=None):
+            ax=None,
+            partitions=None):
+        """
+        Render the geoms for one facet. Facet
+        data subsets are looked up in `partitions`,
+        as built by :meth:`AbstractFaceter.partition`
+        and keyed by the `id` of the full data, when
+        given there.
+        """
+        if partitions is None:
+            partitions = dict()
+
+        def facet_data(data):
+            parts = partitions.get(id(data), None)
+            if parts is None:
+                return faceter.subset(data, i_facet)
+            return parts[i_facet]
+
+        inherited_data = facet_data(self.data)
         for geom in self.geoms:
             geom.render(
                 ax=ax,
-                data=faceter.subset(
-                    geom.data,
-                    i_facet),
-                inherited_data=faceter.subset(
-                    self.data,
-                    i_facet),
+                data=facet_data(geom.data),
+                inherited_data=inherited_data,
                 inherited_mapping=self.mapping,
                 inherited_params=self.params,
                 scales=scales)
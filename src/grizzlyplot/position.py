@@ -5,22 +5,41 @@
 # classes
 
 import numpy as np
-from collections import Counter
 
 
 class Position():
+    __slots__ = ()
+
+    # whether the position adjustment
+    # compares values across groups
+    needs_all_groups = True
 
     def __call__(self, group_scaled_values, scales):
         raise NotImplementedError()
 
+    def get_group_columns(self,
+                          group_scaled_values,
+                          aesthetics):
+        """
+        Gather the per-group values of the given
+        aesthetics into one list per aesthetic
+        """
+        return {aes: [group_vals[aes] for group_vals
+                      in group_scaled_values]
+                for aes in aesthetics}
+
 
 class PositionIdentity(Position):
+    __slots__ = ()
+
+    needs_all_groups = False
 
     def __call__(self, group_scaled_values, scales):
         return group_scaled_values
 
 
 class PositionDodge(Position):
+    __slots__ = ("offsets",)
 
     def __init__(self,
                  offset_x: float = None,
@@ -34,30 +53,67 @@ class PositionDodge(Position):
     def get_clashing_values(self,
                             group_scaled_values,
                             coord):
-        n_groups = len(group_scaled_values)
-        val_counts = Counter()
+        return self.get_column_clashing_values(
+            [group_vals[coord] for group_vals
+             in group_scaled_values])
+
+    def get_column_clashing_values(self,
+                                   coord_values):
+        """
+        Count the groups sharing each group's
+        coord value, and rank each group among
+        them in order, given one array of coord
+        values per group
+        """
+        n_groups = len(coord_values)
+        coord_values = [np.ravel(group_coord_vals)
+                        for group_coord_vals in coord_values]
+        sizes = np.array([group_coord_vals.size
+                          for group_coord_vals in coord_values],
+                         dtype=int)
+        has_val = sizes > 0
+
+        grp_clash_counts = [0] * n_groups
         grp_ranks = [None] * n_groups
-        grp_vals = [None] * n_groups
-        for i_grp, group_vals in enumerate(
-                group_scaled_values):
-            grp_uniqs = np.unique(group_vals[coord])
-            if not grp_uniqs.size < 2:
-                raise ValueError("Need unique coord "
-                                 "values for each group "
-                                 "to use PositionDodge")
-            if grp_uniqs.size > 0:
-                val = grp_uniqs[0]
-                grp_vals[i_grp] = val
-                grp_ranks[i_grp] = val_counts[val]
-                val_counts.update({val})
-        grp_clash_counts = [
-            val_counts[grp_val] for grp_val in grp_vals]
+        if not np.any(has_val):
+            return grp_clash_counts, grp_ranks
+
+        flat = np.concatenate(coord_values)
+        starts = np.cumsum(sizes) - sizes
+        grp_vals = flat[starts[has_val]]
+        expected = np.repeat(grp_vals, sizes[has_val])
+        # NaN != NaN, so all-NaN groups count as unique
+        differs = (flat != expected) & ~(
+            (flat != flat) & (expected != expected))
+        if np.any(differs):
+            raise ValueError("Need unique coord "
+                             "values for each group "
+                             "to use PositionDodge")
+
+        _, inverse, counts = np.unique(
+            grp_vals,
+            return_inverse=True,
+            return_counts=True)
+        # rank groups sharing a value
+        # in their original order
+        order = np.argsort(inverse, kind="stable")
+        run_starts = np.cumsum(counts) - counts
+        ranks = np.empty(len(grp_vals), dtype=int)
+        ranks[order] = (np.arange(len(grp_vals)) -
+                        run_starts[inverse[order]])
+        i_valued = np.flatnonzero(has_val)
+        for i_val, i_grp in enumerate(i_valued):
+            grp_clash_counts[i_grp] = counts[inverse[i_val]]
+            grp_ranks[i_grp] = ranks[i_val]
         return grp_clash_counts, grp_ranks
 
     def position_from_rank(self, n_clashes, rank):
-        delta = np.where(n_clashes > 1,
-                         1 / n_clashes,
-                         0)
+        if np.ndim(n_clashes) == 0:
+            delta = 1 / n_clashes if n_clashes > 1 else 0
+        else:
+            delta = np.where(n_clashes > 1,
+                             1 / n_clashes,
+                             0)
         pos = (rank - 0.5 * n_clashes + 0.5) * delta
         return pos
 
@@ -74,14 +130,17 @@ class PositionDodge(Position):
 
     def __call__(self, group_scaled_values, scales):
         result = list(group_scaled_values)
+        columns = self.get_group_columns(
+            group_scaled_values,
+            self.offsets.keys())
         for coord, offset in self.offsets.items():
-            grp_clash_counts, grp_ranks = self.get_clashing_values(
-                group_scaled_values,
-                coord)
-            for i_group, group_vals in enumerate(
-                    group_scaled_values):
+            coord_values = columns[coord]
+            grp_clash_counts, grp_ranks = (
+                self.get_column_clashing_values(coord_values))
+            for i_group, group_coord_vals in enumerate(
+                    coord_values):
                 result[i_group][coord] = self.transform(
-                    group_vals[coord],
+                    group_coord_vals,
                     grp_clash_counts[i_group],
                     offset,
                     grp_ranks[i_group])
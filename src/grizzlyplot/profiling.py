@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+# filename: profiling.py
+# description: optional per-stage timing
+# of plot rendering, switched on by setting
+# the GRIZZLYPLOT_PROFILE environment variable
+
+import os
+import time
+import logging
+from contextlib import contextmanager, nullcontext
+
+PROFILE = os.environ.get(
+    "GRIZZLYPLOT_PROFILE", "") not in ("", "0")
+
+logger = logging.getLogger("grizzlyplot.perf")
+
+
+class RenderProfile:
+    """
+    Accumulates wall time per rendering
+    stage and logs the totals to the
+    `grizzlyplot.perf` logger. `name` may
+    be any object; it is only formatted
+    when the totals are reported
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.totals = dict()
+
+    @contextmanager
+    def stage(self, stage):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.totals[stage] = (
+                self.totals.get(stage, 0) +
+                time.perf_counter_ns() - start)
+
+    def report(self):
+        logger.info(
+            "%s: %s",
+            self.name,
+            ", ".join(
+                "{} {:.3f} ms".format(stage, total / 1e6)
+                for stage, total in self.totals.items()))
+
+
+class NullProfile:
+    """
+    Stand-in used when profiling is off
+    """
+    _null_stage = nullcontext()
+
+    def stage(self, stage):
+        return self._null_stage
+
+    def report(self):
+        pass
+
+
+_null_profile = NullProfile()
+
+
+def render_profile(name):
+    if PROFILE:
+        return RenderProfile(name)
+    return _null_profile
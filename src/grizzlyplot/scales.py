@@ -9,6 +9,11 @@ from matplotlib.category import StrCategoryConverter, UnitData
 
 
 class Scale():
+    __slots__ = ()
+
+    # whether calling the scale updates
+    # state that depends on call order
+    stateful = False
 
     def __init__(self, **kwargs):
         pass
@@ -27,6 +32,7 @@ class Scale():
 
 
 class ScaleIdentity(Scale):
+    __slots__ = ()
 
     def __init__(self, **kwargs):
         pass
@@ -72,6 +78,12 @@ class ScaleDiscreteManual(ScaleDiscrete):
         self.vals = np.array(
             [keyval[1] for keyval in keyvals])
 
+        # unmatched keys fall through to
+        # index 0, the None entry
+        self._key_to_idx = dict()
+        for i_key, keyval in enumerate(keyvals):
+            self._key_to_idx.setdefault(keyval[0], i_key)
+
         self.strict = strict
 
         super().__init__(**kwargs)
@@ -92,9 +104,11 @@ class ScaleDiscreteManual(ScaleDiscrete):
                     "for {}"
                     "".format(type(x),
                               type(self)))
-            mask = np.argmax(
-                x == self.keys,
-                axis=0)
+            key_to_idx = self._key_to_idx
+            mask = np.fromiter(
+                (key_to_idx.get(val, 0) for val in x.tolist()),
+                dtype=np.intp,
+                count=x.size)
             result = self.vals[mask]
 
             if self.strict:
@@ -138,17 +152,29 @@ class ScaleAxis(Scale):
                 "object?")
         self.scale_name = scale_name
         self.which_axis = axis
+        self._mscale = None
+        self._mscale_key = None
 
     def initialize(self, ax=None):
-        self._mscale = mscale.scale_factory(self.scale_name,
-                                            ax[0])
+        if (
+                self._mscale is None or
+                self._mscale_key[0] != self.scale_name or
+                self._mscale_key[1] is not ax[0]
+        ):
+            self._mscale = mscale.scale_factory(self.scale_name,
+                                                ax[0])
+            self._mscale_key = (self.scale_name, ax[0])
         self.ax = ax
+        # setting a scale rebuilds the axis
+        # transforms, tickers and formatters
         if self.which_axis == "x":
             for axis in self.ax:
-                axis.set_xscale(self.scale_name)
+                if axis.get_xscale() != self.scale_name:
+                    axis.set_xscale(self.scale_name)
         elif self.which_axis == "y":
             for axis in self.ax:
-                axis.set_yscale(self.scale_name)
+                if axis.get_yscale() != self.scale_name:
+                    axis.set_yscale(self.scale_name)
         else:
             raise ValueError(
                 "Attempted to set "
@@ -182,10 +208,13 @@ class ScaleY(ScaleAxis):
 
 
 class ScaleAxisCategorical(ScaleAxis):
+    stateful = True
 
     def initialize(self, ax=None):
         super().initialize(ax=ax)
         self.udat = UnitData()
+        self._n_axis_units = None
+        self._inverse_map = dict()
 
         return self
 
@@ -193,26 +222,47 @@ class ScaleAxisCategorical(ScaleAxis):
 
         x = np.array(x).astype("str")
 
-        result = StrCategoryConverter.convert(x,
-                                              self.udat,
-                                              self.ax[0])
-        if self.which_axis == "x":
-            for axis in self.ax:
-                axis.xaxis.update_units(x)
-        elif self.which_axis == "y":
-            for axis in self.ax:
-                axis.yaxis.update_units(x)
-        else:
-            raise ValueError(
-                "Attempted to call "
-                "axis scale for invalid "
-                "axis {}".format(self.which_axis))
+        # convert each distinct category once,
+        # in the order first seen
+        categories, first_index, inverse = np.unique(
+            x.ravel(),
+            return_index=True,
+            return_inverse=True)
+        first_seen = np.argsort(first_index)
+        category_codes = np.empty(categories.size)
+        category_codes[first_seen] = StrCategoryConverter.convert(
+            categories[first_seen],
+            self.udat,
+            self.ax[0])
+        result = category_codes[inverse].reshape(x.shape)
+        if x.ndim == 0:
+            result = result[()]
+        # the axes only need to hear about
+        # categories once, in the order first seen
+        n_units = len(self.udat._mapping)
+        if n_units != self._n_axis_units:
+            categories = np.array(
+                list(self.udat._mapping.keys()),
+                dtype=str)
+            if self.which_axis == "x":
+                for axis in self.ax:
+                    axis.xaxis.update_units(categories)
+            elif self.which_axis == "y":
+                for axis in self.ax:
+                    axis.yaxis.update_units(categories)
+            else:
+                raise ValueError(
+                    "Attempted to call "
+                    "axis scale for invalid "
+                    "axis {}".format(self.which_axis))
+            self._n_axis_units = n_units
         return result
 
     def invert(self, x):
-        inverse_map = {val: key for key, val in
-                       self.udat._mapping.items()}
-        return inverse_map.get(x, None)
+        if len(self._inverse_map) != len(self.udat._mapping):
+            self._inverse_map = {val: key for key, val in
+                                 self.udat._mapping.items()}
+        return self._inverse_map.get(x, None)
 
     def is_discrete(self):
         return True
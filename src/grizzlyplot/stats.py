@@ -4,15 +4,32 @@
 # description: stat classes
 # inheriting from base class Stat
 
+import hashlib
 import numpy as np
-import KDEpy
 
 
 class Stat():
-    pass
+    __slots__ = ()
+
+    # stats that override batch_apply to
+    # work across groups should set this
+    needs_all_groups = False
+
+    def __call__(self, group_vals, scales):
+        raise NotImplementedError()
+
+    def batch_apply(self, group_scaled_values, scales):
+        """
+        Apply the stat to the scaled values
+        of all groups. Stats that can work
+        on all groups at once may override this.
+        """
+        return [self(group_vals, scales)
+                for group_vals in group_scaled_values]
 
 
 class StatIdentity(Stat):
+    __slots__ = ()
 
     def __init__(self):
         pass
@@ -20,6 +37,9 @@ class StatIdentity(Stat):
     def __call__(self, group_vals, scales):
         return group_vals
 
+    def batch_apply(self, group_scaled_values, scales):
+        return list(group_scaled_values)
+
 
 class StatPointInterval(Stat):
 
@@ -50,27 +70,44 @@ class StatPointInterval(Stat):
         Get properly formatted
         upper and lower errors
         """
-        return np.abs(
-            np.vstack(
+        if self.interval_func is np.quantile:
+            # one sort for both bounds
+            bounds = np.quantile(
+                values,
+                [self.interval_lower,
+                 self.interval_upper])[:, np.newaxis]
+        else:
+            bounds = np.vstack(
                 [self.interval_func(
                     values,
                     self.interval_lower),
                  self.interval_func(
                      values,
                      self.interval_upper)
-                 ]) -
-            point_estimate)
+                 ])
+        return np.abs(bounds - point_estimate)
 
     def __call__(self, group_vals, scales):
 
         result = dict(group_vals)
+        fused = (self.point_estimate_func is np.median and
+                 self.interval_func is np.quantile)
 
         for axis in self.interval_axes:
-            point = self.point_estimate_func(
-                group_vals[axis])
-            error = self.get_errors(
-                group_vals[axis],
-                point)
+            if fused:
+                lower, point, upper = np.quantile(
+                    group_vals[axis],
+                    [self.interval_lower,
+                     0.5,
+                     self.interval_upper])
+                error = np.abs(
+                    np.array([[lower], [upper]]) - point)
+            else:
+                point = self.point_estimate_func(
+                    group_vals[axis])
+                error = self.get_errors(
+                    group_vals[axis],
+                    point)
             result[axis] = point
             result[axis + "err"] = error
 
@@ -82,6 +119,9 @@ class StatDensity(Stat):
     support_axis_to_density_axis = {
         "x": "y",
         "y": "x"}
+    # fits of at most this many bytes of
+    # data are memoized, up to cache_size fits
+    max_cached_nbytes = 2 ** 20
 
     def __init__(self,
                  estimator_function=None,
@@ -90,8 +130,13 @@ class StatDensity(Stat):
                  autolimit_margin=0.05,
                  kernel="gaussian",
                  bw="silverman",
+                 cache_size=128,
+                 shared_support=False,
                  **kwargs):
         if estimator_function is None:
+            # imported here since KDEpy pulls in
+            # scipy, which is slow to import
+            import KDEpy
             estimator_function = KDEpy.FFTKDE
         self.estimator_function = estimator_function(
             kernel=kernel,
@@ -106,17 +151,104 @@ class StatDensity(Stat):
                              "{}".format(support_axis))
         self.n_points = n_points
         # passed to the estimator
+        self.cache_size = cache_size
+        self._density_cache = dict()
+        # evaluating every group on one support
+        # grid needs all groups at once
+        self.shared_support = shared_support
+        self.needs_all_groups = shared_support
+
+    def clear_cache(self):
+        """
+        Forget memoized density estimates
+        """
+        self._density_cache.clear()
+
+    def estimate_density(self, vals_to_fit):
+        """
+        Fit the estimator to (transformed) values
+        and evaluate it. Results for small inputs
+        are memoized by a digest of the values,
+        so redrawing a plot does not refit.
+        """
+        vals_to_fit = np.ascontiguousarray(vals_to_fit)
+        if (self.cache_size < 1 or
+                vals_to_fit.nbytes > self.max_cached_nbytes):
+            return self.estimator_function.fit(
+                vals_to_fit).evaluate(self.n_points)
+
+        key = (
+            hashlib.blake2b(vals_to_fit.tobytes()).digest(),
+            vals_to_fit.dtype.str,
+            vals_to_fit.shape,
+            self.n_points)
+        cached = self._density_cache.get(key, None)
+        if cached is None:
+            support, density = self.estimator_function.fit(
+                vals_to_fit).evaluate(self.n_points)
+            support.setflags(write=False)
+            density.setflags(write=False)
+            if len(self._density_cache) >= self.cache_size:
+                # evict the oldest entry
+                del self._density_cache[
+                    next(iter(self._density_cache))]
+            cached = (support, density)
+            self._density_cache[key] = cached
+        return cached
+
+    def batch_apply(self, group_scaled_values, scales):
+        """
+        Estimate the density of each group. With
+        `shared_support`, all groups are evaluated
+        on one grid spanning every group's data
+        and kernel support, so their densities
+        line up point for point.
+        """
+        if not self.shared_support:
+            return super().batch_apply(
+                group_scaled_values,
+                scales)
+        group_scaled_values = list(group_scaled_values)
+        if len(group_scaled_values) < 1:
+            return []
+        ax_scale = scales[self.support_axis]
+        estimator = self.estimator_function
+        all_vals_to_fit = [
+            np.asarray(ax_scale.transform(
+                group_vals[self.support_axis]), dtype="float")
+            for group_vals in group_scaled_values]
+
+        lower, upper = np.inf, -np.inf
+        for vals_to_fit in all_vals_to_fit:
+            estimator.fit(vals_to_fit)
+            reach = estimator.kernel.practical_support(estimator.bw)
+            lower = min(lower, np.min(vals_to_fit) - reach)
+            upper = max(upper, np.max(vals_to_fit) + reach)
+        # keep the data strictly inside the grid
+        margin = 1e-3 * (upper - lower)
+        grid = np.linspace(
+            lower - margin,
+            upper + margin,
+            2 ** 10 if self.n_points is None else self.n_points)
+        support = ax_scale.invert(grid)
+
+        results = []
+        for group_vals, vals_to_fit in zip(
+                group_scaled_values, all_vals_to_fit):
+            result = dict(group_vals)
+            result["support"] = support
+            result["density"] = estimator.fit(
+                vals_to_fit).evaluate(grid)
+            results.append(result)
+        return results
 
     def __call__(self, group_vals, scales):
         ax_scale = scales[self.support_axis]
         vals_to_fit = ax_scale.transform(
             group_vals[self.support_axis])
 
-        support, density = self.estimator_function.fit(
-            vals_to_fit
-        ).evaluate(
-            self.n_points
-        )
+        support, density = self.estimate_density(
+            vals_to_fit)
 
         result = dict(group_vals)
         result["support"] = ax_scale.invert(support)
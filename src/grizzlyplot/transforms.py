@@ -16,6 +16,22 @@ from matplotlib.transforms import (
 import numpy as np
 
 
+def _flat_axes(axes):
+    """
+    List the axes in a possibly
+    nested collection of axes
+    """
+    if isinstance(axes, np.ndarray):
+        return list(axes.flat)
+    if isinstance(axes, (list, tuple)):
+        nested = (list, tuple, np.ndarray)
+        if not any(isinstance(item, nested) for item in axes):
+            return list(axes)
+        return [axis for item in axes
+                for axis in _flat_axes(item)]
+    return [axes]
+
+
 class DynamicTransform(Transform):
     """
     Transforms that recheck
@@ -23,6 +39,13 @@ class DynamicTransform(Transform):
     each time they are called,
     using a transform_getter function
     """
+    __slots__ = (
+        "transform_getter",
+        "figure",
+        "axes",
+        "_transform",
+        "_signature")
+
     input_dims = 2
     output_dims = 2
 
@@ -32,6 +55,8 @@ class DynamicTransform(Transform):
                  axes: Axes = None,
                  **kwargs):
         self.transform_getter = transform_getter
+        self._transform = None
+        self._signature = None
         self.figure = figure
         self.axes = axes
         if (
@@ -41,9 +66,47 @@ class DynamicTransform(Transform):
             self.axes = self.figure.axes
         super().__init__(**kwargs)
 
+    # Transform copies and pickles only
+    # __dict__, so carry the slots over too
+    def __copy__(self):
+        other = super().__copy__()
+        for name in DynamicTransform.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def __getstate__(self):
+        return (super().__getstate__(),
+                {name: getattr(self, name)
+                 for name in DynamicTransform.__slots__})
+
+    def __setstate__(self, state):
+        dict_state, slot_state = state
+        super().__setstate__(dict_state)
+        for name, value in slot_state.items():
+            setattr(self, name, value)
+
+    def get_signature(self):
+        """
+        Axis state that the transform
+        depends on
+        """
+        return tuple(
+            (axis.get_xlim(),
+             axis.get_ylim(),
+             axis.get_xscale(),
+             axis.get_yscale(),
+             axis.bbox.bounds)
+            for axis in _flat_axes(self.axes))
+
     def refresh(self):
-        self._transform = self.transform_getter(
-            self.figure, self.axes)
+        signature = self.get_signature()
+        if (
+                self._transform is None or
+                signature != self._signature
+        ):
+            self._transform = self.transform_getter(
+                self.figure, self.axes)
+            self._signature = signature
 
     def transform(self, values):
         self.refresh()
@@ -55,26 +118,52 @@ class DynamicTransform(Transform):
 
 
 def get_bbox_from_axes(fig, axes):
-    bbox = None
-
-    for axis in np.array(axes).flatten():
+    axes = _flat_axes(axes)
+    if len(axes) < 1:
+        return None
 
-        data_to_figure = axis.transData + fig.transSubfigure.inverted()
+    figure_inverse = fig.transSubfigure.inverted()
+    corners = np.empty((len(axes), 2, 2))
+    for i_axis, axis in enumerate(axes):
         dat_x, dat_y = axis.get_xlim(), axis.get_ylim()
-        bbox_lim = [data_to_figure.transform([dat_x[0], dat_y[0]]),
-                    data_to_figure.transform([dat_x[1], dat_y[1]])]
-        if bbox is None:
-            bbox = Bbox(bbox_lim)
-        else:
-            bbox = bbox.union([bbox, Bbox(bbox_lim)])
-        pass
+        corners[i_axis] = (axis.transData + figure_inverse).transform(
+            [[dat_x[0], dat_y[0]],
+             [dat_x[1], dat_y[1]]])
+
+    if len(axes) == 1:
+        return Bbox(corners[0])
+    return Bbox([corners.min(axis=(0, 1)),
+                 corners.max(axis=(0, 1))])
 
-    return bbox
+
+def get_axes_from_gridspec(fig, gs):
+    """
+    Get the axes of a figure that belong to a
+    gridspec. Axes are grouped by gridspec once
+    and regrouped when the figure's axes change.
+    """
+    axes = tuple(fig.axes)
+    # cached on the figure itself, as (its axes,
+    # axes grouped by gridspec), so the cache
+    # lives and dies with the figure
+    cached = getattr(fig, "_grizzlyplot_gs_axes", None)
+    if cached is None or cached[0] != axes:
+        by_gridspec = dict()
+        for ax in axes:
+            ax_gs = ax.get_gridspec()
+            by_gridspec.setdefault(
+                id(ax_gs), (ax_gs, []))[1].append(ax)
+        cached = (axes, by_gridspec)
+        fig._grizzlyplot_gs_axes = cached
+    match = cached[1].get(id(gs), None)
+    if match is None or match[0] is not gs:
+        return []
+    return list(match[1])
 
 
 def get_bbox_from_gridspec(fig, gs):
-    axes = [ax for ax in fig.axes if ax.get_gridspec() == gs]
-    return get_bbox_from_axes(fig, axes)
+    return get_bbox_from_axes(
+        fig, get_axes_from_gridspec(fig, gs))
 
 
 def get_axspan_transform(fig, axes):
@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import setup, find_packages
 
 with open("README.md", 'r') as f:
     long_description = f.read()
@@ -12,5 +12,5 @@ setup(
    author='Dylan H. Morris',
    author_email='foomail@foo.example',
    url="http://www.foopackage.example/",
-   packages=['grizzlyplot'],  # same as name
+   packages=find_packages(exclude=["test", "test.*"]),
 )
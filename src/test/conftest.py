@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+# render headlessly; set before any
+# test module imports pyplot
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import polars as pl
+import pytest
+
+# rewrite asserts in the shared test helpers
+pytest.register_assert_rewrite("helpers")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup():
+    """
+    Pay polars and matplotlib one-time
+    startup costs once per session
+    """
+    pl.DataFrame({"x": [1]}).lazy().select(
+        pl.col("x") + 1).collect()
+    fig = plt.figure()
+    plt.close(fig)
+
+
+@pytest.fixture
+def blank_fig():
+    """
+    Empty figure to render into,
+    closed after the test
+    """
+    fig = plt.figure()
+    yield fig
+    fig.clf()
+    plt.close(fig)
+
+
+@pytest.fixture(scope="module")
+def df_test():
+    return pl.from_dict(
+        {
+            "a": [1, 2, 3],
+            "b": ["x", "y", "z"],
+            "c": [2.5, 3.6, 4.7]
+        },
+        schema=[
+            ("a", pl.Int64),
+            ("b", pl.Utf8),
+            ("c", pl.Float64)
+        ]
+    )
+
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+
+def assert_column_equal(actual, expected):
+    """
+    Assert two columns of values are equal,
+    using the cheapest exact comparison
+    for their dtype
+    """
+    actual = np.asarray(actual)
+    expected = np.asarray(expected)
+    if actual.dtype.kind in "iuf":
+        np.testing.assert_allclose(actual, expected,
+                                   rtol=0, atol=0)
+    elif actual.dtype.kind == "O":
+        assert actual.shape == expected.shape
+        assert actual.tolist() == expected.tolist()
+    else:
+        np.testing.assert_array_equal(actual, expected)
@@ -1,108 +1,105 @@
 from grizzlyplot import GrizzlyPlot
 import grizzlyplot.faceter as faceter
 import polars as pl
-import numpy as np
+import matplotlib.pyplot as plt
 import pytest
 
 
-def test_facet_definition_in_grizzlyplot():
-    some_numbers = [1, 2, 3, 4]
-    n_unique_numbers = np.unique(some_numbers).size
-    some_letters = ["a", "b", "c", "c"]
-    n_unique_letters = np.unique(some_letters).size
-
+some_numbers = [1, 2, 3, 4]
+n_unique_numbers = len(set(some_numbers))
+some_letters = ["a", "b", "c", "c"]
+n_unique_letters = len(set(some_letters))
+
+# facet argument and expected (n_rows, n_cols)
+facet_scenarios = {
+    "row_col": (
+        dict(row="letter_data", col="number_data"),
+        n_unique_letters,
+        n_unique_numbers),
+    "row_only": (
+        dict(row="letter_data"),
+        n_unique_letters,
+        1),
+    "col_only": (
+        dict(col="letter_data"),
+        1,
+        n_unique_letters)
+}
+
+
+@pytest.fixture(scope="module")
+def facet_df():
+    return pl.DataFrame({
+        "number_data": some_numbers,
+        "letter_data": some_letters})
+
+
+@pytest.fixture(scope="module",
+                params=list(facet_scenarios.keys()))
+def faceter_and_axes(request, facet_df):
+    """
+    Imputed faceter for each faceting
+    scenario, with its axes created once
+    and shared by the tests below
+    """
+    facet, n_rows, n_cols = facet_scenarios[request.param]
     test_plot = GrizzlyPlot(
-        data=pl.DataFrame({
-            "number_data": some_numbers,
-            "letter_data": some_letters}),
-        facet=dict(
-            row="letter_data",
-            col="number_data")
+        data=facet_df,
+        facet=facet
     )
+    test_faceter = test_plot.get_faceter()
+    fig, ax = test_faceter.get_axes()
+    yield test_faceter, fig, ax, n_rows, n_cols
+    plt.close(fig)
 
-    row_col_faceter = test_plot.get_faceter()
 
-    assert isinstance(row_col_faceter,
+def test_faceter_type(faceter_and_axes):
+    test_faceter, _, _, _, _ = faceter_and_axes
+    assert isinstance(test_faceter,
                       faceter.GridFaceter)
-    assert isinstance(row_col_faceter,
+    assert isinstance(test_faceter,
                       faceter.AbstractFaceter)
 
-    assert row_col_faceter.n_cols() == n_unique_numbers
-    assert row_col_faceter.n_rows() == n_unique_letters
-    expected_n_facets = n_unique_numbers * n_unique_letters
-    assert row_col_faceter.n_facets() == expected_n_facets
-
-    fig, ax = row_col_faceter.get_axes()
-
-    assert all([fig == axis.get_figure()
-                for axis in ax])
-    coerced = row_col_faceter.coerce_axis_geometry(
-        ax)
-    assert coerced.shape == (expected_n_facets,)
-
-    test_plot_no_col = GrizzlyPlot(
-        data=pl.DataFrame({
-            "number_data": some_numbers,
-            "letter_data": some_letters}),
-        facet=dict(
-            row="letter_data")
-    )
-
-    row_col_faceter_no_col = test_plot_no_col.get_faceter()
 
-    assert isinstance(row_col_faceter_no_col,
-                      faceter.GridFaceter)
-    assert isinstance(row_col_faceter_no_col,
-                      faceter.AbstractFaceter)
+def test_n_cols(faceter_and_axes):
+    test_faceter, _, _, _, n_cols = faceter_and_axes
+    assert test_faceter.n_cols() == n_cols
 
-    assert row_col_faceter_no_col.n_cols() == 1
-    assert row_col_faceter_no_col.n_rows() == n_unique_letters
-    expected_n_facets_no_col = 1 * n_unique_letters
-    assert row_col_faceter_no_col.n_facets() == expected_n_facets_no_col
 
-    fig_no_col, ax_no_col = row_col_faceter_no_col.get_axes()
+def test_n_rows(faceter_and_axes):
+    test_faceter, _, _, n_rows, _ = faceter_and_axes
+    assert test_faceter.n_rows() == n_rows
 
-    assert all([fig_no_col == axis.get_figure()
-                for axis in ax_no_col])
-    coerced_no_col = row_col_faceter_no_col.coerce_axis_geometry(
-        ax_no_col)
-    assert coerced_no_col.shape == (expected_n_facets_no_col,)
 
-    test_plot_no_row = GrizzlyPlot(
-        data=pl.DataFrame({
-            "number_data": some_numbers,
-            "letter_data": some_letters}),
-        facet=dict(
-            col="letter_data")
-    )
-    row_col_faceter_no_row = test_plot_no_row.get_faceter()
+def test_n_facets(faceter_and_axes):
+    test_faceter, _, _, n_rows, n_cols = faceter_and_axes
+    assert test_faceter.n_facets() == n_rows * n_cols
 
-    assert isinstance(row_col_faceter_no_row,
-                      faceter.GridFaceter)
-    assert isinstance(row_col_faceter_no_row,
-                      faceter.AbstractFaceter)
 
-    assert row_col_faceter_no_row.n_cols() == n_unique_letters
-    assert row_col_faceter_no_row.n_rows() == 1
-    expected_n_facets_no_row = n_unique_letters * 1
-    assert row_col_faceter_no_row.n_facets() == expected_n_facets_no_row
+def test_axes_share_figure(faceter_and_axes):
+    _, fig, ax, _, _ = faceter_and_axes
+    assert all(fig is axis.get_figure()
+               for axis in ax)
 
-    fig_no_row, ax_no_row = row_col_faceter_no_row.get_axes()
 
-    assert all([fig_no_row == axis.get_figure()
-                for axis in ax_no_row])
-    coerced_no_row = row_col_faceter_no_row.coerce_axis_geometry(
-        ax_no_row)
-    assert coerced_no_row.shape == (expected_n_facets_no_row,)
+def test_coerced_shape(faceter_and_axes):
+    test_faceter, _, ax, n_rows, n_cols = faceter_and_axes
+    coerced = test_faceter.coerce_axis_geometry(
+        ax)
+    assert coerced.shape == (n_rows * n_cols,)
 
 
-def test_facet_definition_with_explicit_argument():
+@pytest.mark.parametrize(
+    "faceter_arg",
+    [pytest.param(faceter.GridFaceter, id="constructor"),
+     pytest.param("grid", id="string")])
+def test_facet_definition_with_explicit_argument(faceter_arg):
     some_numbers = [8, 23, 6, 16, 8, 2, 2, 5]
-    n_unique_numbers = np.unique(some_numbers).size
+    n_unique_numbers = len(set(some_numbers))
     some_letters = ["a", "b", "c", "c", "z", "z", "c", "q"]
-    n_unique_letters = np.unique(some_letters).size
+    n_unique_letters = len(set(some_letters))
 
-    test_plot_explicit_constructor = GrizzlyPlot(
+    plot = GrizzlyPlot(
         data=pl.DataFrame({
             "number_data": some_numbers,
             "letter_data": some_letters}),
@@ -110,42 +107,52 @@ def test_facet_definition_with_explicit_argument():
             facet_mapping=dict(
                 row="letter_data",
                 col="number_data")),
-        faceter=faceter.GridFaceter,
-        impute_faceting=False
-    )
-    test_plot_explicit_string = GrizzlyPlot(
-        data=pl.DataFrame({
-            "number_data": some_numbers,
-            "letter_data": some_letters}),
-        facet=dict(
-            facet_mapping=dict(
-                row="letter_data",
-                col="number_data")),
-        faceter="grid",
+        faceter=faceter_arg,
         impute_faceting=False
     )
+    test_faceter = plot.get_faceter()
+
+    assert isinstance(test_faceter,
+                      faceter.GridFaceter)
+    assert isinstance(test_faceter,
+                      faceter.AbstractFaceter)
 
-    for plot in [test_plot_explicit_constructor,
-                 test_plot_explicit_string]:
-        test_faceter = plot.get_faceter()
+    assert test_faceter.n_cols() == n_unique_numbers
+    assert test_faceter.n_rows() == n_unique_letters
+    expected_n_facets = n_unique_numbers * n_unique_letters
+    assert test_faceter.n_facets() == expected_n_facets
 
-        assert isinstance(test_faceter,
-                          faceter.GridFaceter)
-        assert isinstance(test_faceter,
-                          faceter.AbstractFaceter)
+    fig, ax = test_faceter.get_axes()
 
-        assert test_faceter.n_cols() == n_unique_numbers
-        assert test_faceter.n_rows() == n_unique_letters
-        expected_n_facets = n_unique_numbers * n_unique_letters
-        assert test_faceter.n_facets() == expected_n_facets
+    assert all(fig is axis.get_figure()
+               for axis in ax)
+    coerced = test_faceter.coerce_axis_geometry(
+        ax)
+    assert coerced.shape == (expected_n_facets,)
+    plt.close(fig)
 
-        fig, ax = test_faceter.get_axes()
 
-        assert all([fig == axis.get_figure()
-                    for axis in ax])
-        coerced = test_faceter.coerce_axis_geometry(
-            ax)
-        assert coerced.shape == (expected_n_facets,)
+def test_get_faceter_is_cached(facet_df):
+    test_plot = GrizzlyPlot(
+        data=facet_df,
+        facet=dict(row="letter_data"))
+    assert test_plot.get_faceter() is test_plot.get_faceter()
+
+
+def test_expression_facet_levels_sorted_by_value():
+    """
+    Levels of an expression mapping are
+    sorted on the mapped values, not by
+    re-applying the expression to them
+    """
+    test_plot = GrizzlyPlot(
+        data=pl.DataFrame({"number_data": [2, 1, 3]}),
+        facet=dict(row=-pl.col("number_data")))
+    test_faceter = test_plot.get_faceter()
+    assert test_faceter.get_dimension_levels(
+        "row").to_series().to_list() == [-3, -2, -1]
+    assert test_faceter.get_level_labels(
+        "row") == ["-3", "-2", "-1"]
 
 
 def test_faceter_validation():
@@ -181,5 +188,101 @@ def test_faceter_validation():
         test_plot_neither_string_nor_callable.get_faceter()
 
 
+def test_grid_faceter_label_gating(facet_df):
+    facet_mapping = dict(
+        row="letter_data",
+        col="number_data")
+
+    default_faceter = faceter.GridFaceter(
+        facet_mapping=facet_mapping)
+    default_faceter.add_levels_from_data(facet_df)
+    n_cols = default_faceter.n_cols()
+    assert default_faceter.is_col_labeled(0)
+    assert not default_faceter.is_col_labeled(n_cols)
+    assert default_faceter.is_row_labeled(n_cols - 1)
+    assert not default_faceter.is_row_labeled(0)
+
+    no_col_loc_faceter = faceter.GridFaceter(
+        facet_mapping=facet_mapping,
+        col_label_loc=None)
+    no_col_loc_faceter.add_levels_from_data(facet_df)
+    assert not any(
+        no_col_loc_faceter.is_col_labeled(i_facet)
+        for i_facet in range(no_col_loc_faceter.n_facets()))
+
+
 def test_wrap_faceter_by_col():
     pass
+
+
+partition_df = pl.DataFrame({
+    "f": ["u", "v", None, "u", "v", "w"],
+    "g": ["a", "b", "a", None, "b", "a"],
+    "n": [1, 2, 3, 1, 2, 3],
+    "z": [0.5, float("nan"), 0.5, 1.5, float("nan"), 1.5]})
+
+partition_cases = {
+    "unmapped": (faceter.GridFaceter, dict()),
+    "nulls": (faceter.GridFaceter, dict(row="f", col="g")),
+    "nan": (faceter.GridFaceter, dict(row="z")),
+    "expression": (faceter.GridFaceter,
+                   dict(row=pl.col("n") > 1, col="g")),
+    "list": (faceter.GridFaceter, dict(row=["f", "g"])),
+    "duplicate_keys": (faceter.GridFaceter, dict(row="f", col="f")),
+    "wrap": (faceter.WrapFaceter, dict(wrap="f")),
+}
+
+
+@pytest.mark.parametrize("case", list(partition_cases.keys()))
+@pytest.mark.parametrize("missing_levels", [False, True],
+                         ids=["all_levels", "missing_levels"])
+def test_partition_matches_subset(case, missing_levels):
+    faceter_class, facet_mapping = partition_cases[case]
+    test_faceter = faceter_class(facet_mapping=facet_mapping)
+    test_faceter.add_levels_from_data(partition_df)
+    data = partition_df
+    if missing_levels:
+        data = partition_df.head(3)
+    parts = test_faceter.partition(data)
+    assert len(parts) == test_faceter.n_facets()
+    for i_facet, part in enumerate(parts):
+        assert part.equals(test_faceter.subset(data, i_facet))
+
+
+def test_partition_with_scalar_keys(monkeypatch):
+    """
+    polars < 1.0 keys single-column
+    partitions by scalar, not tuple
+    """
+    partition_by = pl.DataFrame.partition_by
+
+    def scalar_keyed_partition_by(self, *args, **kwargs):
+        parts = partition_by(self, *args, **kwargs)
+        return {key[0] if len(key) == 1 else key: part
+                for key, part in parts.items()}
+
+    monkeypatch.setattr(pl.DataFrame, "partition_by",
+                        scalar_keyed_partition_by)
+    test_faceter = faceter.WrapFaceter(
+        facet_mapping=dict(wrap="g"))
+    test_faceter.add_levels_from_data(partition_df)
+    parts = test_faceter.partition(partition_df)
+    for i_facet, part in enumerate(parts):
+        assert part.equals(test_faceter.subset(partition_df, i_facet))
+    # rows with a null level are not matched, as in subset
+    assert sum(part.height for part in parts) == (
+        partition_df["g"].is_not_null().sum())
+
+
+def test_label_where_returns_copies():
+    label = faceter.label_where("top")
+    label["y"] = -100
+    label["color"] = "red"
+    assert faceter.label_where("top") == faceter._label_locations(
+        faceter.plot_defaults["facet_label_pad_x"],
+        faceter.plot_defaults["facet_label_pad_y"])["top"]
+    assert "color" not in faceter.label_where("top")
+    assert faceter.label_where("top")["y"] > 1
+    default = dict(x=0)
+    assert faceter.label_where("nowhere", default) is default
+    assert faceter.label_where("nowhere") is None
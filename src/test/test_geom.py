@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 
 from grizzlyplot import GrizzlyPlot
+import grizzlyplot.geom as geom_module
 import grizzlyplot.geoms as geoms
+from matplotlib.collections import LineCollection
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import polars as pl
 import pytest
 
 
-def test_can_render():
+def test_can_render(blank_fig):
     plot = GrizzlyPlot(
         geoms=[
             geoms.GeomHLines(
@@ -35,4 +41,243 @@ def test_can_render():
         ]
     )
 
-    plot.render()
+    fig, _ = plot.render(fig=blank_fig)
+    assert fig is blank_fig
+
+
+def test_xy_lines_draw_at_line_zorder(blank_fig):
+    plot = GrizzlyPlot(
+        data=pl.DataFrame({
+            "x": [1, 2, 3, 1, 2, 3],
+            "y": [1.0, 2.0, 3.0, 2.0, 3.0, 4.0],
+            "lw": [1, 1, 1, 2, 2, 2]}),
+        geoms=[
+            geoms.GeomXY(
+                mapping=dict(x="x", y="y", lw="lw"),
+                color="blue")
+        ]
+    )
+    plot.render(fig=blank_fig)
+    artists = [artist for ax in blank_fig.axes
+               for artist in ax.collections + ax.lines]
+    assert len(artists) > 0
+    assert all(artist.get_zorder() == mpl.lines.Line2D.zorder
+               for artist in artists)
+
+
+exponential_cases = [
+    pytest.param(geoms.GeomExponentialX, "x", "y", id="x"),
+    pytest.param(geoms.GeomExponentialY, "y", "x", id="y")
+]
+
+
+@pytest.mark.parametrize("geom_class,time_axis,value_axis",
+                         exponential_cases)
+def test_exponential_curves_draw_at_line_zorder(
+        blank_fig, geom_class, time_axis, value_axis):
+    plot = GrizzlyPlot(
+        geoms=[
+            geom_class(
+                rate=0.5,
+                **{time_axis + "min": 0,
+                   time_axis + "max": 5,
+                   value_axis + "intercept": 1})
+        ]
+    )
+    plot.render(fig=blank_fig)
+    collections = [collection for ax in blank_fig.axes
+                   for collection in ax.collections]
+    assert len(collections) == 1
+    assert collections[0].get_zorder() == mpl.lines.Line2D.zorder
+
+
+@pytest.mark.parametrize("fallback_params", [
+    pytest.param(dict(marker="o"), id="marker"),
+    pytest.param(dict(color=None), id="unset_color")])
+@pytest.mark.parametrize("geom_class,time_axis,value_axis",
+                         exponential_cases)
+def test_exponential_group_fallback(
+        blank_fig, geom_class, time_axis, value_axis,
+        fallback_params):
+    """
+    Curves with markers or an unset color
+    are drawn group by group
+    """
+    plot = GrizzlyPlot(
+        geoms=[
+            geom_class(
+                rate=0.5,
+                **fallback_params,
+                **{time_axis + "min": 0,
+                   time_axis + "max": 5,
+                   value_axis + "intercept": 1})
+        ]
+    )
+    plot.render(fig=blank_fig)
+    lines = [line for ax in blank_fig.axes
+             for line in ax.lines]
+    assert len(lines) == 1
+
+
+@pytest.mark.parametrize("geom,mapping", [
+    pytest.param(geoms.GeomDensity(), dict(x="y"), id="density"),
+    pytest.param(geoms.GeomViolin(linecolor="k"), dict(x="x", y="y"),
+                 id="violin")])
+def test_density_default_zorder(blank_fig, geom, mapping):
+    rng = np.random.default_rng(3)
+    plot = GrizzlyPlot(
+        data=pl.DataFrame({
+            "x": [1.0] * 50,
+            "y": rng.normal(size=50)}),
+        mapping=mapping,
+        geoms=[geom])
+    plot.render(fig=blank_fig)
+    ax = blank_fig.axes[0]
+    lines = ax.lines + [collection for collection in ax.collections
+                        if isinstance(collection, LineCollection)]
+    fills = [collection for collection in ax.collections
+             if not isinstance(collection, LineCollection)]
+    assert len(lines) > 0 and len(fills) > 0
+    assert all(line.get_zorder() == mpl.lines.Line2D.zorder
+               for line in lines)
+    assert all(fill.get_zorder() == 1 for fill in fills)
+
+
+def drawn_data(fig):
+    """
+    Coordinates of the lines and
+    collections drawn on a figure
+    """
+    result = []
+    for ax in fig.axes:
+        result += [line.get_xydata() for line in ax.lines]
+        for collection in ax.collections:
+            if isinstance(collection, LineCollection):
+                result += collection.get_segments()
+            else:
+                result.append(collection.get_offsets())
+    return result
+
+
+def test_group_workers_match_serial_render(monkeypatch):
+    n_pools = []
+
+    class CountingExecutor(geom_module.ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            n_pools.append(1)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(geom_module, "ThreadPoolExecutor",
+                        CountingExecutor)
+    rng = np.random.default_rng(5)
+    data = pl.DataFrame({
+        "x": rng.normal(size=200),
+        "y": rng.normal(size=200),
+        "g": np.arange(200) % 20}).sort("g", "x")
+    drawn = []
+    for group_workers in [None, 4]:
+        fig = plt.figure()
+        GrizzlyPlot(
+            data=data,
+            mapping=dict(x="x", y="y", group="g"),
+            geoms=[geoms.GeomXY(color="k", marker="o")],
+            group_workers=group_workers
+        ).render(fig=fig)
+        drawn.append(drawn_data(fig))
+        plt.close(fig)
+    serial, threaded = drawn
+    assert len(n_pools) > 0
+    assert len(serial) == len(threaded) > 1
+    assert all(np.array_equal(a, b) for a, b in zip(serial, threaded))
+
+
+def test_group_workers_from_plot_params():
+    geom = geoms.GeomPoint()
+    assert geom.streams_groups()
+    assert not geom.streams_groups(dict(group_workers=4))
+    assert geoms.GeomPoint(group_workers=2).get_plot_param(
+        "group_workers", dict(group_workers=4)) == 2
+
+
+def render_points(geom, **params):
+    rng = np.random.default_rng(7)
+    fig = plt.figure()
+    GrizzlyPlot(
+        data=pl.DataFrame({
+            "x": rng.normal(size=500),
+            "y": rng.normal(size=500)}),
+        mapping=dict(x="x", y="y"),
+        geoms=[geom],
+        **params
+    ).render(fig=fig)
+    ax = fig.axes[0]
+    result = (len(ax.images), len(ax.lines),
+              ax.get_xlim(), ax.get_ylim())
+    plt.close(fig)
+    return result
+
+
+def test_large_point_groups_draw_density_raster():
+    n_images, n_lines, xlim, ylim = render_points(
+        geoms.GeomPoint(color="k"),
+        large_data_threshold=100)
+    _, _, marker_xlim, marker_ylim = render_points(
+        geoms.GeomPoint(color="k"))
+    assert (n_images, n_lines) == (1, 0)
+    assert np.allclose(xlim, marker_xlim)
+    assert np.allclose(ylim, marker_ylim)
+
+
+@pytest.mark.parametrize("geom", [
+    pytest.param(geoms.GeomXY(color="k", marker="o"), id="line"),
+    pytest.param(geoms.GeomPoint(color=None), id="unset_color")])
+def test_large_point_groups_fallback_to_plot(geom):
+    n_images, n_lines, _, _ = render_points(
+        geom,
+        large_data_threshold=100)
+    assert n_images == 0
+    assert n_lines == 1
+
+
+@pytest.mark.parametrize("axis", ["x", "y"])
+@pytest.mark.parametrize("intercepts", [
+    [0.25, 0.5],
+    [0.5, 3.0],
+    [-2.0, 0.5, 5.0]],
+    ids=["inside", "above", "both_sides"])
+def test_axis_spanning_lines_match_axline(axis, intercepts):
+    intercepts = np.array(intercepts)
+    lows = np.zeros_like(intercepts)
+    highs = np.full_like(intercepts, 0.75)
+    fig, (ax_line, ax_span) = plt.subplots(1, 2)
+    for ax in (ax_line, ax_span):
+        ax.plot([0, 1], [0, 1])
+    axline = ax_line.axhline if axis == "y" else ax_line.axvline
+    limit_names = ("xmin", "xmax") if axis == "y" else ("ymin", "ymax")
+    for intercept, low, high in zip(intercepts, lows, highs):
+        axline(intercept,
+               **dict(zip(limit_names, (low, high))),
+               color="k", alpha=0.5, lw=2, ls="--")
+    n_lines_before = len(ax_span.lines)
+    geoms._add_axis_spanning_lines(
+        ax_span,
+        axis,
+        intercepts,
+        lows,
+        highs,
+        color="k",
+        alpha=0.5,
+        lw=2,
+        ls="--")
+
+    assert np.allclose(ax_span.dataLim.get_points(),
+                       ax_line.dataLim.get_points())
+    assert ax_span.get_xlim() == pytest.approx(ax_line.get_xlim())
+    assert ax_span.get_ylim() == pytest.approx(ax_line.get_ylim())
+    assert len(ax_span.lines) == n_lines_before
+    [collection] = ax_span.collections
+    segments = collection.get_segments()
+    assert len(segments) == len(ax_line.lines) - n_lines_before
+    for segment, line in zip(segments, ax_line.lines[n_lines_before:]):
+        assert np.allclose(segment, line.get_xydata())
+    plt.close(fig)
@@ -3,58 +3,66 @@
 import grizzlyplot as gp
 import grizzlyplot.geoms as geoms
 import polars as pl
-import numpy as np
 import pytest
+import re
 
-df_test = pl.DataFrame(
-    {
-        "a": [1, 2, 3],
-        "b": ["x", "y", "z"],
-        "c": [2.5, 3.6, 4.7]
-    }
-)
+from helpers import assert_column_equal
 
+# polars raised ComputeError for invalid
+# arithmetic before InvalidOperationError
+invalid_arithmetic_errors = (
+    pl.exceptions.ComputeError,
+    pl.exceptions.InvalidOperationError)
+invalid_arithmetic_msg = re.compile(
+    r"arithmetic on .* not allowed")
 
-def test_string_geom_level_mapping():
+# expression mappings shared by the tests below
+EXPR_X = pl.col("a") + pl.col("c")
+EXPR_Y = pl.col("b") + pl.col("b")
+EXPR_BAD_COLOR = pl.col("b") + pl.col("a")
+EXPR_GOOD_COLOR = (
+    pl.col("b").cast(pl.Utf8) +
+    pl.col("a").cast(pl.Utf8))
+
+
+@pytest.fixture(scope="module")
+def expected(df_test):
     """
-    Test that string based
-    mappings correctly
-    map dataframe columns
-    to aesthetics at the
-    geom level
+    Expected values of the expression
+    mappings, collected from one lazy query
     """
-    geom = geoms.GeomXY(
+    query = df_test.lazy().select(
+        (pl.col("a") + pl.col("c")).alias("x"),
+        (pl.col("b") + pl.col("b")).alias("y"),
+        (pl.col("b") + pl.col("a").cast(pl.Utf8)).alias("color")
+    )
+    try:
+        return query.collect(engine="streaming")
+    except TypeError:
+        # older polars only take a streaming flag
+        return query.collect(streaming=True)
+
+
+string_mapping_cases = [
+    ("x", "a"),
+    ("y", "b"),
+    ("color", "c")
+]
+
+
+@pytest.fixture(scope="module")
+def string_geom():
+    return geoms.GeomXY(
         mapping=dict(
             x="a",
             y="b",
             color="c")
     )
-    aes_vals = {aes:
-                geom.get_aesthetic_values(
-                    aesthetic=aes,
-                    data=df_test,
-                    inherited_mapping=None,
-                    inherited_params=None)
-                for aes in ["x", "y", "color"]}
-    expected = {
-        "x": df_test["a"].to_numpy(),
-        "y": df_test["b"].to_numpy(),
-        "color": df_test["c"].to_numpy()
-    }
-
-    for aes in expected.keys():
-        assert np.all(expected[aes] == aes_vals[aes])
-
-
-def test_string_plot_level_mapping():
-    """
-    Test that string based
-    mappings correctly
-    map dataframe columns
-    to aesthetics at the
-    plot level
-    """
-    plot = gp.GrizzlyPlot(
+
+
+@pytest.fixture(scope="module")
+def string_plot():
+    return gp.GrizzlyPlot(
         mapping=dict(
             x="a",
             y="b",
@@ -67,26 +75,44 @@ def test_string_plot_level_mapping():
         y=4,
         color="blue")
 
-    geom = plot.geoms[0]
 
-    aes_vals = {aes:
-                geom.get_aesthetic_values(
-                    aesthetic=aes,
-                    data=df_test,
-                    inherited_mapping=plot.mapping,
-                    inherited_params=plot.params)
-                for aes in ["x", "y", "color"]}
-    expected = {
-        "x": df_test["a"].to_numpy(),
-        "y": df_test["b"].to_numpy(),
-        "color": df_test["c"].to_numpy()
-    }
+@pytest.mark.parametrize("aes,col", string_mapping_cases)
+def test_string_geom_level_mapping(string_geom, df_test,
+                                   aes, col):
+    """
+    Test that string based
+    mappings correctly
+    map dataframe columns
+    to aesthetics at the
+    geom level
+    """
+    assert string_geom.get_aesthetic_values(
+        aesthetic=aes,
+        data=df_test,
+        inherited_mapping=None,
+        inherited_params=None,
+        as_series=True).equals(df_test[col])
 
-    for aes in expected.keys():
-        assert np.all(expected[aes] == aes_vals[aes])
+
+@pytest.mark.parametrize("aes,col", string_mapping_cases)
+def test_string_plot_level_mapping(string_plot, df_test,
+                                   aes, col):
+    """
+    Test that string based
+    mappings correctly
+    map dataframe columns
+    to aesthetics at the
+    plot level
+    """
+    assert string_plot.geoms[0].get_aesthetic_values(
+        aesthetic=aes,
+        data=df_test,
+        inherited_mapping=string_plot.mapping,
+        inherited_params=string_plot.params,
+        as_series=True).equals(df_test[col])
 
 
-def test_expression_geom_level_mapping():
+def test_expression_geom_level_mapping(df_test, expected):
     """
     Test that expression-based
     mappings correctly
@@ -96,36 +122,33 @@ def test_expression_geom_level_mapping():
     """
     geom = geoms.GeomXY(
         mapping=dict(
-            x=pl.col("a") + pl.col("c"),
-            y=pl.col("b") + pl.col("b"),
-            color=pl.col("b") + pl.col("a"))
+            x=EXPR_X,
+            y=EXPR_Y,
+            color=EXPR_BAD_COLOR)
     )
 
-    assert np.all(
+    assert_column_equal(
         geom.get_aesthetic_values(
             aesthetic="x",
             data=df_test,
             inherited_mapping=None,
-            inherited_params=None) ==
-        df_test.select(
-            pl.col("a") + pl.col("c")
-        ).to_series().to_numpy()
+            inherited_params=None),
+        expected["x"].to_numpy()
     )
 
-    assert np.all(
+    assert_column_equal(
         geom.get_aesthetic_values(
             aesthetic="y",
             data=df_test,
             inherited_mapping=None,
-            inherited_params=None) ==
-        df_test.select(
-            pl.col("b") + pl.col("b")
-        ).to_series().to_numpy()
+            inherited_params=None),
+        expected["y"].to_numpy()
     )
 
     # attempt to do invalid expression computation
     # raises Error
-    with pytest.raises(pl.exceptions.ComputeError):
+    with pytest.raises(invalid_arithmetic_errors,
+                       match=invalid_arithmetic_msg):
         geom.get_aesthetic_values(
             aesthetic="color",
             data=df_test,
@@ -134,23 +157,19 @@ def test_expression_geom_level_mapping():
 
     # fixing invalid computation
     # succeeds as expected
-    geom.mapping["color"] = (
-        pl.col("b").cast(pl.Utf8) +
-        pl.col("a").cast(pl.Utf8))
+    geom.mapping["color"] = EXPR_GOOD_COLOR
 
-    assert np.all(
+    assert_column_equal(
         geom.get_aesthetic_values(
             aesthetic="color",
             data=df_test,
             inherited_mapping=None,
-            inherited_params=None) ==
-        df_test.select(
-            pl.col("b") + pl.col("a").cast(pl.Utf8)
-        ).to_series().to_numpy()
+            inherited_params=None),
+        expected["color"].to_numpy()
     )
 
 
-def test_expression_plot_level_mapping():
+def test_expression_plot_level_mapping(df_test, expected):
     """
     Test that expression-based
     mappings correctly
@@ -160,9 +179,9 @@ def test_expression_plot_level_mapping():
     """
     plot = gp.GrizzlyPlot(
         mapping=dict(
-            x=pl.col("a") + pl.col("c"),
-            y=pl.col("b") + pl.col("b"),
-            color=pl.col("b") + pl.col("a")),
+            x=EXPR_X,
+            y=EXPR_Y,
+            color=EXPR_BAD_COLOR),
         geoms=[
             geoms.GeomXY(
                 inherit_mapping=True)
@@ -173,31 +192,28 @@ def test_expression_plot_level_mapping():
 
     geom = plot.geoms[0]
     
-    assert np.all(
+    assert_column_equal(
         geom.get_aesthetic_values(
             aesthetic="x",
             data=df_test,
             inherited_mapping=plot.mapping,
-            inherited_params=plot.params) ==
-        df_test.select(
-            pl.col("a") + pl.col("c")
-        ).to_series().to_numpy()
+            inherited_params=plot.params),
+        expected["x"].to_numpy()
     )
 
-    assert np.all(
+    assert_column_equal(
         geom.get_aesthetic_values(
             aesthetic="y",
             data=df_test,
             inherited_mapping=plot.mapping,
-            inherited_params=plot.params) ==
-        df_test.select(
-            pl.col("b") + pl.col("b")
-        ).to_series().to_numpy()
+            inherited_params=plot.params),
+        expected["y"].to_numpy()
     )
 
     # attempt to do invalid expression computation
     # raises Error
-    with pytest.raises(pl.exceptions.ComputeError):
+    with pytest.raises(invalid_arithmetic_errors,
+                       match=invalid_arithmetic_msg):
         geom.get_aesthetic_values(
             aesthetic="color",
             data=df_test,
@@ -206,17 +222,37 @@ def test_expression_plot_level_mapping():
 
     # fixing invalid computation
     # succeeds as expected
-    plot.mapping["color"] = (
-        pl.col("b").cast(pl.Utf8) +
-        pl.col("a").cast(pl.Utf8))
+    plot.mapping["color"] = EXPR_GOOD_COLOR
 
-    assert np.all(
+    assert_column_equal(
         geom.get_aesthetic_values(
             aesthetic="color",
             data=df_test,
             inherited_mapping=plot.mapping,
-            inherited_params=plot.params) ==
-        df_test.select(
-            pl.col("b") + pl.col("a").cast(pl.Utf8)
-        ).to_series().to_numpy()
+            inherited_params=plot.params),
+        expected["color"].to_numpy()
     )
+
+
+def test_shared_expression_mapping(df_test, expected):
+    """
+    Test that aesthetics mapped to the
+    same expression share one evaluation
+    """
+    geom = geoms.GeomXY(
+        mapping=dict(
+            x=EXPR_X,
+            y=EXPR_X,
+            color="b")
+    )
+    aes_vals = geom.get_aesthetics_values(
+        ["x", "y", "color"],
+        data=df_test,
+        inherited_mapping=None,
+        inherited_params=None)
+
+    assert aes_vals["x"] is aes_vals["y"]
+    assert_column_equal(aes_vals["x"],
+                        expected["x"].to_numpy())
+    assert_column_equal(aes_vals["color"],
+                        df_test["b"].to_numpy())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+from grizzlyplot.position import PositionDodge
+import numpy as np
+import pytest
+
+
+def test_dodge_clashing_values():
+    dodge = PositionDodge(offset_x=1)
+    clash_counts, ranks = dodge.get_clashing_values(
+        [{"x": np.array([1.0, 1.0])},
+         {"x": np.array([2.0])},
+         {"x": np.array([])},
+         {"x": np.array([1.0])}],
+        "x")
+    assert list(clash_counts) == [2, 1, 0, 2]
+    assert list(ranks) == [0, 0, None, 1]
+
+
+def test_dodge_requires_unique_group_values():
+    dodge = PositionDodge(offset_x=1)
+    with pytest.raises(ValueError):
+        dodge.get_clashing_values(
+            [{"x": np.array([1.0, 2.0])}],
+            "x")
+
+
+def test_dodge_all_nan_group():
+    dodge = PositionDodge(offset_x=1)
+    clash_counts, ranks = dodge.get_clashing_values(
+        [{"x": np.array([np.nan, np.nan])},
+         {"x": np.array([1.0])}],
+        "x")
+    assert list(clash_counts) == [1, 1]
+    assert list(ranks) == [0, 0]
+
+    result = dodge(
+        [{"x": np.array([np.nan, np.nan])},
+         {"x": np.array([1.0])}],
+        scales=None)
+    assert np.all(np.isnan(result[0]["x"]))
+    assert result[1]["x"] == pytest.approx([1.0])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+from grizzlyplot.scales import (
+    ScaleDiscreteManual,
+    ScaleXCategorical,
+    ScaleYCategorical)
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("scale_class", [
+    ScaleXCategorical,
+    ScaleYCategorical])
+def test_categorical_codes_follow_first_seen_order(scale_class):
+    fig, ax = plt.subplots()
+    scale = scale_class().initialize(ax=[ax])
+    first = scale(["q", "p"])
+    second = scale(np.array(["q", "r"]))
+    assert list(np.concatenate([first, second])) == [0, 1, 0, 2]
+    assert scale("p") == 1
+    assert [scale.invert(code) for code in range(3)] == ["q", "p", "r"]
+
+    axis = ax.xaxis if scale_class is ScaleXCategorical else ax.yaxis
+    fig.canvas.draw()
+    ticks = axis.get_ticklocs()
+    labels = [label.get_text() for label in axis.get_ticklabels()]
+    assert list(ticks) == [0, 1, 2]
+    assert labels == ["q", "p", "r"]
+    plt.close(fig)
+
+
+def broadcast_manual_lookup(scale, x):
+    """
+    Key lookup as ScaleDiscreteManual
+    did it by broadcasting against its keys
+    """
+    return scale.vals[np.argmax(np.asarray(x) == scale.keys, axis=0)]
+
+
+@pytest.mark.parametrize("mapping,x,expected", [
+    ({"a": "red", "b": "blue"},
+     ["b", "a", "c", "b"],
+     ["blue", "red", None, "blue"]),
+    ({1: "red", 2.0: "blue"},
+     np.array([1.0, 2.0, 3.0]),
+     ["red", "blue", None]),
+    ({1.0: "red", 2: "blue"},
+     [2, 1, 3],
+     ["blue", "red", None]),
+    ({1: "red", 1.0: "blue"},
+     np.array([1]),
+     ["blue"]),
+    (dict(), ["a"], [None])],
+    ids=["str", "int_keys", "float_keys", "int_float_clash", "empty"])
+def test_manual_scale_lookup(mapping, x, expected):
+    scale = ScaleDiscreteManual(mapping=mapping)
+    assert list(scale(x)) == expected
+    assert list(scale(x)) == list(broadcast_manual_lookup(scale, x))
+
+
+def test_manual_scale_scalar_and_none():
+    scale = ScaleDiscreteManual(mapping={"a": 1, 2: 3})
+    assert list(scale("a")) == [1]
+    assert list(scale(2.0)) == [3]
+    assert scale(None) is None
+
+
+def test_manual_scale_strict():
+    scale = ScaleDiscreteManual(
+        mapping={"a": "red", "b": "blue"},
+        strict=True)
+    assert list(scale(["b", "a"])) == ["blue", "red"]
+    with pytest.raises(ValueError, match="'c'"):
+        scale(["a", "c", "b"])
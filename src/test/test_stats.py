@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+from grizzlyplot.scales import ScaleX, ScaleY
+from grizzlyplot.stats import StatDensity
+import KDEpy
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+
+class CountingFFTKDE(KDEpy.FFTKDE):
+    """
+    FFTKDE that counts its fits
+    """
+    n_fits = 0
+
+    def fit(self, *args, **kwargs):
+        CountingFFTKDE.n_fits += 1
+        return super().fit(*args, **kwargs)
+
+
+@pytest.fixture
+def density_scales():
+    fig, ax = plt.subplots()
+    yield {"x": ScaleX().initialize(ax=[ax]),
+           "y": ScaleY().initialize(ax=[ax])}
+    plt.close(fig)
+
+
+@pytest.fixture
+def counting_stat(monkeypatch):
+    monkeypatch.setattr(CountingFFTKDE, "n_fits", 0)
+
+    def make_stat(**kwargs):
+        return StatDensity(
+            estimator_function=CountingFFTKDE,
+            **kwargs)
+    return make_stat
+
+
+def test_density_cache_hit(counting_stat, density_scales):
+    stat = counting_stat()
+    values = np.random.default_rng(5).normal(size=200)
+    first = stat({"y": values}, density_scales)
+    # equal values in a new array hit the cache
+    second = stat({"y": values.copy()}, density_scales)
+    assert CountingFFTKDE.n_fits == 1
+    assert np.array_equal(first["support"], second["support"])
+    assert np.array_equal(first["density"], second["density"])
+
+    stat({"y": values + 1}, density_scales)
+    assert CountingFFTKDE.n_fits == 2
+
+    stat.clear_cache()
+    stat({"y": values}, density_scales)
+    assert CountingFFTKDE.n_fits == 3
+
+
+def test_density_cache_disabled_and_evicted(
+        counting_stat, density_scales):
+    values = np.arange(10.0)
+    uncached = counting_stat(cache_size=0)
+    first = uncached({"y": values}, density_scales)
+    second = uncached({"y": values}, density_scales)
+    assert CountingFFTKDE.n_fits == 2
+    assert np.array_equal(first["density"], second["density"])
+
+    CountingFFTKDE.n_fits = 0
+    small = counting_stat(cache_size=2)
+    for shift in range(3):
+        small({"y": values + shift}, density_scales)
+    assert len(small._density_cache) == 2
+    # the oldest fit was evicted, the newest kept
+    small({"y": values + 2}, density_scales)
+    assert CountingFFTKDE.n_fits == 3
+    small({"y": values}, density_scales)
+    assert CountingFFTKDE.n_fits == 4
+
+
+def test_density_shared_support(density_scales):
+    stat = StatDensity(support_axis="x", shared_support=True)
+    assert stat.needs_all_groups
+    rng = np.random.default_rng(3)
+    groups = [{"x": rng.normal(size=100), "g": "a"},
+              {"x": rng.normal(loc=5, size=50), "g": "b"}]
+    results = stat.batch_apply(groups, density_scales)
+
+    assert [result["g"] for result in results] == ["a", "b"]
+    support = results[0]["support"]
+    assert results[1]["support"] is support
+    assert support.min() < min(group["x"].min() for group in groups)
+    assert support.max() > max(group["x"].max() for group in groups)
+    for result in results:
+        assert result["density"].shape == support.shape
+        assert np.trapezoid(result["density"], support) == (
+            pytest.approx(1, abs=1e-3))
+    assert stat.batch_apply([], density_scales) == []
+
+
+def test_density_unshared_support(density_scales):
+    stat = StatDensity(support_axis="x")
+    assert not stat.needs_all_groups
+    groups = [{"x": np.arange(5.0)},
+              {"x": np.arange(5.0) + 10}]
+    results = stat.batch_apply(groups, density_scales)
+    assert not np.array_equal(results[0]["support"],
+                              results[1]["support"])
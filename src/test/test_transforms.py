@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+from grizzlyplot.transforms import (
+    dynamic_axspan_transform,
+    get_bbox_from_gridspec)
+import matplotlib.pyplot as plt
+import numpy as np
+import copy
+import gc
+import pickle
+import weakref
+
+
+def test_dynamic_transform_copies_keep_slots():
+    fig, ax = plt.subplots(2)
+    transform = dynamic_axspan_transform(fig, ax)
+    points = [[0, 0], [1, 1]]
+    expected = transform.transform(points)
+    for other in [copy.copy(transform),
+                  pickle.loads(pickle.dumps(transform))]:
+        assert np.allclose(other.transform(points), expected)
+    plt.close(fig)
+
+
+def test_gridspec_axes_cache_does_not_keep_figures_alive():
+    figure_refs = []
+    for _ in range(3):
+        fig, ax = plt.subplots(2)
+        bbox = get_bbox_from_gridspec(
+            fig, ax[0].get_gridspec())
+        assert bbox is not None
+        figure_refs.append(weakref.ref(fig))
+        plt.close(fig)
+        del fig, ax
+    gc.collect()
+    assert all(ref() is None for ref in figure_refs)